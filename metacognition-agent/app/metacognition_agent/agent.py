@@ -670,4 +670,10 @@ if __name__ == "__main__":
         # Start monitoring workspace
         await metacognition_agent.monitor_workspace()
     
-    asyncio.run(main()) 
\ No newline at end of file
+    # Run on uvloop when it's installed, unless USE_UVLOOP=false
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    use_uvloop = uvloop is not None and os.getenv("USE_UVLOOP", "true").lower() == "true"
+    (uvloop.run if use_uvloop else asyncio.run)(main()) 
\ No newline at end of file
@@ -5,7 +5,9 @@ Manages coordination between specialized metacognition agents
 
 import os
 import asyncio
-from typing import Dict, List, Optional, Any
+import logging
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from google.adk.agents import Agent, SequentialAgent, ParallelAgent, LoopAgent
 from google.adk.tools.agent_tool import AgentTool
 
@@ -18,6 +20,9 @@ class MetacognitionCoordinator:
     
     def __init__(self):
         self.agents = {}
+        self._agent_tools: Dict[str, AgentTool] = {}
+        self.logger = logging.getLogger("metacognition_coordinator")
+        self._model = metacognition_engine.cfg.model
         self._setup_agents()
     
     def _setup_agents(self):
@@ -26,7 +31,7 @@ class MetacognitionCoordinator:
         # Task Planner Agent - Specialized in task decomposition and planning
         self.agents["task_planner"] = Agent(
             name="task_planner",
-            model=os.getenv("METACOGNITION_MODEL", "gemini-2.0-flash-live-001"),
+            model=self._model,
             description="Specialized agent for task decomposition, planning, and strategy development",
             instruction="""You are a task planning specialist. Your job is to:
 1. Analyze complex tasks and break them down into manageable steps
@@ -47,7 +52,7 @@ Always use the appropriate tools to create comprehensive task plans and consider
         # Progress Monitor Agent - Specialized in progress tracking and monitoring
         self.agents["progress_monitor"] = Agent(
             name="progress_monitor",
-            model=os.getenv("METACOGNITION_MODEL", "gemini-2.0-flash-live-001"),
+            model=self._model,
             description="Specialized agent for monitoring task progress and identifying issues",
             instruction="""You are a progress monitoring specialist. Your job is to:
 1. Monitor task execution progress in real-time
@@ -67,10 +72,10 @@ Always use the appropriate tools to monitor progress and provide timely insights
         # Agent Orchestrator - Specialized in agent coordination and execution
         self.agents["agent_orchestrator"] = Agent(
             name="agent_orchestrator",
-            model=os.getenv("METACOGNITION_MODEL", "gemini-2.0-flash-live-001"),
+            model=self._model,
             description="Specialized agent for coordinating and executing agent actions",
             instruction="""You are an agent orchestration specialist. Your job is to:
-1. Execute task steps using appropriate agents
+1. Execute task steps using appropriate agents, batching steps that don't depend on each other with execute_task_steps
 2. Coordinate between different agent types
 3. Handle agent failures and retries
 4. Optimize agent resource allocation
@@ -80,6 +85,7 @@ Always use the appropriate tools to execute steps and coordinate agent actions e
 """,
             tools=[
                 metacognition_tools.execute_task_step,
+                metacognition_tools.execute_task_steps,
                 metacognition_tools.get_agent_performance
             ]
         )
@@ -87,7 +93,7 @@ Always use the appropriate tools to execute steps and coordinate agent actions e
         # Reflection Engine - Specialized in metacognitive reflection and analysis
         self.agents["reflection_engine"] = Agent(
             name="reflection_engine",
-            model=os.getenv("METACOGNITION_MODEL", "gemini-2.0-flash-live-001"),
+            model=self._model,
             description="Specialized agent for metacognitive reflection and self-analysis",
             instruction="""You are a reflection and analysis specialist. Your job is to:
 1. Analyze task execution patterns and outcomes
@@ -107,7 +113,7 @@ Always use the appropriate tools to analyze performance and generate insights.
         # Metacognition Coordinator - Main coordinator agent
         self.agents["metacognition_coordinator"] = Agent(
             name="metacognition_coordinator",
-            model=os.getenv("METACOGNITION_MODEL", "gemini-2.0-flash-live-001"),
+            model=self._model,
             description="Main coordinator agent that manages the entire metacognition system",
             instruction="""You are the main coordinator for the metacognition system. Your job is to:
 1. Receive user requests and create orchestration tasks
@@ -125,10 +131,10 @@ You can use AgentTool to invoke other agents:
 Coordinate effectively to provide the best orchestration experience.
 """,
             tools=[
-                AgentTool(agent=self.agents["task_planner"]),
-                AgentTool(agent=self.agents["progress_monitor"]),
-                AgentTool(agent=self.agents["agent_orchestrator"]),
-                AgentTool(agent=self.agents["reflection_engine"]),
+                self.get_agent_tool("task_planner"),
+                self.get_agent_tool("progress_monitor"),
+                self.get_agent_tool("agent_orchestrator"),
+                self.get_agent_tool("reflection_engine"),
                 metacognition_tools.create_orchestration_task,
                 metacognition_tools.monitor_task_progress,
                 metacognition_tools.assess_task_completion
@@ -143,6 +149,13 @@ Coordinate effectively to provide the best orchestration experience.
         """Get all available agents"""
         return self.agents.copy()
     
+    def get_agent_tool(self, name: str) -> AgentTool:
+        """Get the AgentTool for an agent, creating it on first request"""
+        tool = self._agent_tools.get(name)
+        if tool is None:
+            tool = self._agent_tools[name] = AgentTool(agent=self.agents[name])
+        return tool
+    
     def create_task_lifecycle_workflow(self, name: str = "task_lifecycle_workflow") -> SequentialAgent:
         """Create a sequential workflow for complete task lifecycle"""
         agent_list = [
@@ -171,6 +184,35 @@ Coordinate effectively to provide the best orchestration experience.
             description="Parallel monitoring and orchestration: progress_monitor || agent_orchestrator"
         )
     
+    async def _run_agent(self, name: str, task_ctx) -> Tuple[float, List[Any]]:
+        """Run an agent to completion, returning its start time and emitted events"""
+        started = time.perf_counter()
+        events = [event async for event in self.agents[name].run_async(task_ctx)]
+        return started, events
+    
+    async def run_monitoring_concurrent(self, task_ctx) -> Tuple[List[Any], List[Any]]:
+        """Run progress_monitor and agent_orchestrator concurrently on the same invocation context
+        
+        Opt-in alternative to create_parallel_monitoring_workflow that guarantees both
+        agents are driven at the same time rather than relying on ParallelAgent scheduling.
+        """
+        async with asyncio.TaskGroup() as tg:
+            monitor = tg.create_task(self._run_agent("progress_monitor", task_ctx))
+            orchestrator = tg.create_task(self._run_agent("agent_orchestrator", task_ctx))
+        
+        monitor_start, monitor_events = monitor.result()
+        orchestrator_start, orchestrator_events = orchestrator.result()
+        self.logger.debug(
+            f"Concurrent monitoring start skew: {abs(monitor_start - orchestrator_start) * 1000:.2f} ms"
+        )
+        return monitor_events, orchestrator_events
+    
+    async def aclose(self):
+        """Release shared resources held by the coordinator's tools (call on shutdown)"""
+        await metacognition_tools.aclose()
+        await metacognition_engine.stop_reflection_loop()
+        await metacognition_engine.flush_thoughts()
+    
     def create_reflection_loop_workflow(self, name: str = "reflection_loop_workflow") -> LoopAgent:
         """Create a loop workflow for continuous reflection"""
         return LoopAgent(
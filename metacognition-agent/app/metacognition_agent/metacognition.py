@@ -6,13 +6,36 @@ Provides internal monologue capabilities and self-reflection for intelligent tas
 import os
 import asyncio
 import json
+import sqlite3
 import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple, NamedTuple, Union, Callable
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import logging
 
+# Cold storage schema for thoughts that have left the in-memory hot window
+_THOUGHT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS thoughts(
+    id INTEGER PRIMARY KEY,
+    ts REAL,
+    type TEXT,
+    content TEXT,
+    context BLOB,
+    conf REAL
+);
+CREATE INDEX IF NOT EXISTS ix_type_ts ON thoughts(type, ts DESC);
+"""
+_THOUGHT_FLUSH_BATCH = 50
+
+# Seconds a partial batch of thoughts waits before it is written anyway
+_THOUGHT_FLUSH_INTERVAL = 1.0
+
+# Bounded pool for reflection aggregation so CPU bursts stay off the event loop
+_REFLECTION_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="reflection")
+
 class ReflectionType(Enum):
     """Types of metacognitive reflection"""
     TASK_ANALYSIS = "task_analysis"
@@ -29,18 +52,102 @@ class MonologueLevel(Enum):
     ANALYTICAL = "analytical"
     REFLECTIVE = "reflective"
 
-@dataclass
+# Wall-clock time corresponding to monotonic zero, used to render monotonic timestamps lazily
+_BOOT_WALL = datetime.now() - timedelta(microseconds=time.monotonic_ns() // 1000)
+_BOOT_WALL_TS = _BOOT_WALL.timestamp()
+
+def _ns_to_dt(ns: int, epoch0: datetime = _BOOT_WALL) -> datetime:
+    """Convert a time.monotonic_ns() reading to a wall-clock datetime"""
+    return epoch0 + timedelta(microseconds=ns // 1000)
+
+def _ns_to_ts(ns: int) -> float:
+    """Convert a time.monotonic_ns() reading to a POSIX timestamp"""
+    return _BOOT_WALL_TS + ns / 1e9
+
+# Shared sentinel for thoughts without extracted action items or insights
+_EMPTY: Tuple[str, ...] = ()
+
+def _tuple_or_empty(items: List[str]) -> Tuple[str, ...]:
+    """Freeze extracted items, reusing the shared empty tuple when there are none"""
+    return tuple(items) if items else _EMPTY
+
+class ReflectionTemplate:
+    """IDs of the registered reflection text templates"""
+    TASK_CREATED = "task_created"
+    PLAN_CREATED = "plan_created"
+    STEP_EXECUTED = "step_executed"
+
+# Template text by ID, formatted with a message's task_id and payload
+REFLECTION_TEMPLATES: Dict[str, str] = {
+    ReflectionTemplate.TASK_CREATED: (
+        "Created new orchestration task: {task_description}\n"
+        "Task ID: {task_id}\n"
+        "Estimated steps: {estimated_steps}\n"
+        "User request: {user_request}"
+    ),
+    ReflectionTemplate.PLAN_CREATED: (
+        "Created execution plan for task {task_id}:\n"
+        "Total steps: {total_steps}\n"
+        "Estimated duration: {estimated_duration}\n"
+        "Required agents: {required_agents}"
+    ),
+    ReflectionTemplate.STEP_EXECUTED: (
+        "Executed step {step_number} for task {task_id}:\n"
+        "Agent: {agent}\n"
+        "Action: {action}\n"
+        "Status: {status}\n"
+        "Result: {message}"
+    ),
+}
+
+@dataclass(slots=True)
+class ReflectionMsg:
+    """A templated reflection request, rendered to text only when think() records it
+    
+    context_keys names the payload entries that go into the thought's context alongside
+    task_id. Messages queued behind this one for the same task can be appended to
+    follow_ups and are rendered and recorded as part of the same thought.
+    """
+    thought_type: ReflectionType
+    template_id: str
+    task_id: str
+    payload: Dict[str, Any]
+    context_keys: Tuple[str, ...] = ()
+    follow_ups: List["ReflectionMsg"] = field(default_factory=list)
+    
+    def render(self) -> str:
+        """Format this message and any follow-ups into the thought text"""
+        return "\n\n".join(
+            REFLECTION_TEMPLATES[msg.template_id].format(task_id=msg.task_id, **msg.payload)
+            for msg in (self, *self.follow_ups)
+        )
+    
+    def context(self) -> Dict[str, Any]:
+        """Build the thought context from this message and any follow-ups"""
+        context = {}
+        for msg in (self, *self.follow_ups):
+            context["task_id"] = msg.task_id
+            for key in msg.context_keys:
+                context[key] = msg.payload[key]
+        return context
+
+@dataclass(slots=True, frozen=True)
 class MetacognitiveThought:
     """Represents a single metacognitive thought or reflection"""
-    timestamp: datetime
+    timestamp_ns: int
     thought_type: ReflectionType
     content: str
     context: Dict[str, Any]
     confidence: float
-    action_items: List[str]
-    insights: List[str]
+    action_items: Tuple[str, ...]
+    insights: Tuple[str, ...]
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Wall-clock time the thought was recorded"""
+        return _ns_to_dt(self.timestamp_ns)
 
-@dataclass
+@dataclass(slots=True)
 class TaskProgress:
     """Tracks progress of a specific task"""
     task_id: str
@@ -50,7 +157,7 @@ class TaskProgress:
     completion_percentage: float
     status: str
     start_time: datetime
-    last_update: datetime
+    last_update_ns: int
     estimated_completion: Optional[datetime]
     bottlenecks: List[str]
     successes: List[str]
@@ -66,12 +173,84 @@ class OrchestrationState:
     resource_utilization: Dict[str, float]
     last_reflection: Optional[datetime]
 
+class ProgressSnapshot(NamedTuple):
+    """Aggregated task statistics used by progress reflection"""
+    total_tasks: int
+    active_tasks: int
+    completed_tasks: int
+    avg_completion: float
+
+class BottleneckSnapshot(NamedTuple):
+    """Aggregated bottleneck statistics used by bottleneck analysis"""
+    bottleneck_frequency: Dict[str, int]
+    bottleneck_lines: str
+    most_common: str
+    total_instances: int
+    unique_types: int
+
+def _compute_progress_snapshot(tasks: Tuple[TaskProgress, ...], status_counts: Dict[str, int]) -> ProgressSnapshot:
+    """Aggregate progress statistics over a frozen view of the tasks"""
+    total_tasks = sum(status_counts.values())
+    active_tasks = status_counts.get("active", 0)
+    completed_tasks = status_counts.get("completed", 0)
+    avg_completion = sum(t.completion_percentage for t in tasks) / max(total_tasks, 1)
+    return ProgressSnapshot(total_tasks, active_tasks, completed_tasks, avg_completion)
+
+def _compute_bottleneck_snapshot(tasks: Tuple[TaskProgress, ...]) -> BottleneckSnapshot:
+    """Aggregate bottleneck statistics over a frozen view of the tasks"""
+    counts = Counter(b for task in tasks for b in task.bottlenecks)
+    bottleneck_frequency = dict(counts)
+    return BottleneckSnapshot(
+        bottleneck_frequency=bottleneck_frequency,
+        bottleneck_lines=chr(10).join(f"- {b}: {freq} occurrences" for b, freq in bottleneck_frequency.items()),
+        most_common=counts.most_common(1)[0][0] if counts else "None",
+        total_instances=sum(counts.values()),
+        unique_types=len(counts)
+    )
+
+@dataclass(frozen=True, slots=True)
+class _MetaConfig:
+    """Metacognition settings resolved once from the environment"""
+    model: str
+    reflection_interval: int
+    enabled: bool
+    threshold: float
+    log_level: str
+    monologue_level: MonologueLevel
+    thought_db: Optional[str]
+    thought_history: int
+    
+    @classmethod
+    def from_env(cls) -> "_MetaConfig":
+        """Read all metacognition settings from environment variables"""
+        return cls(
+            model=os.getenv("METACOGNITION_MODEL", "gemini-2.0-flash-live-001"),
+            reflection_interval=int(os.getenv("METACOGNITION_REFLECTION_INTERVAL", "60")),
+            enabled=os.getenv("ENABLE_INTERNAL_MONOLOGUE", "true").lower() == "true",
+            threshold=float(os.getenv("TASK_COMPLETION_THRESHOLD", "0.95")),
+            log_level=os.getenv("MONOLOGUE_LOG_LEVEL", "INFO"),
+            monologue_level=MonologueLevel(os.getenv("MONOLOGUE_LEVEL", MonologueLevel.DETAILED.value).lower()),
+            thought_db=os.getenv("METACOGNITION_THOUGHT_DB") or None,
+            thought_history=int(os.getenv("METACOGNITION_THOUGHT_HISTORY", "1000"))
+        )
+
 class MetacognitionEngine:
     """Core metacognition engine with internal monologue and self-reflection"""
     
     def __init__(self):
-        self.thoughts: List[MetacognitiveThought] = []
+        self.cfg = _MetaConfig.from_env()
+        
+        # Hot window of recent thoughts; older ones live in the SQLite store when configured
+        self.thought_db_path = self.cfg.thought_db
+        hot_window = self.cfg.thought_history if self.thought_db_path else None
+        self.thoughts: deque = deque(maxlen=max(hot_window, _THOUGHT_FLUSH_BATCH) if hot_window else None)
+        self._thought_db: Optional[sqlite3.Connection] = None
+        self._thought_rows: List[Tuple] = []  # queued for the writer, oldest first
+        self._thought_wakeup: Optional[asyncio.Event] = None
+        self._thought_writer: Optional[asyncio.Task] = None
         self.task_progress: Dict[str, TaskProgress] = {}
+        self._status_counter: Counter = Counter()
+        self._task_locks: defaultdict = defaultdict(asyncio.Lock)
         self.orchestration_state = OrchestrationState(
             active_tasks=[],
             available_agents=[],
@@ -80,37 +259,150 @@ class MetacognitionEngine:
             resource_utilization={},
             last_reflection=None
         )
-        self.monologue_level = MonologueLevel.DETAILED
-        self.reflection_interval = int(os.getenv("METACOGNITION_REFLECTION_INTERVAL", "60"))
-        self.enabled = os.getenv("ENABLE_INTERNAL_MONOLOGUE", "true").lower() == "true"
+        self.monologue_level = self.cfg.monologue_level
+        self.reflection_interval = self.cfg.reflection_interval
+        self.enabled = self.cfg.enabled
+        self._reflecting = False
         
         # Setup logging
         self.logger = logging.getLogger("metacognition")
-        self.logger.setLevel(getattr(logging, os.getenv("MONOLOGUE_LOG_LEVEL", "INFO")))
+        self.logger.setLevel(getattr(logging, self.cfg.log_level))
+        
+        if self.thought_db_path:
+            self._open_thought_store()
         
-        # Do NOT start the reflection loop here; must be started from an async context
-        # Call await metacognition_engine.start_reflection_loop() from an async context to start
+        # The reflection loop needs a running event loop, so it starts lazily on the first thought
+        self._reflection_task: Optional[asyncio.Task] = None
     
-    async def think(self, thought_type: ReflectionType, content: str, context: Dict[str, Any] = None) -> MetacognitiveThought:
-        """Generate a metacognitive thought"""
+    async def think(self, thought_type: Union[ReflectionType, ReflectionMsg],
+                    content: Union[str, Callable[[], str]] = None,
+                    context: Dict[str, Any] = None) -> MetacognitiveThought:
+        """Generate a metacognitive thought
+        
+        Content may be a zero-argument callable so callers can defer building the
+        reflection text until it is known the thought will actually be recorded.
+        A ReflectionMsg may be passed in place of the type, content and context.
+        """
         if not self.enabled:
             return None
         
+        self._ensure_reflection_loop()
+        
+        if isinstance(thought_type, ReflectionMsg):
+            msg = thought_type
+            thought_type, content, context = msg.thought_type, msg.render, msg.context()
+        
+        if callable(content):
+            content = content()
+        
         thought = MetacognitiveThought(
-            timestamp=datetime.now(),
+            timestamp_ns=time.monotonic_ns(),
             thought_type=thought_type,
             content=content,
             context=context or {},
             confidence=self._assess_confidence(content, context),
-            action_items=self._extract_action_items(content),
-            insights=self._extract_insights(content)
+            action_items=_tuple_or_empty(self._extract_action_items(content)),
+            insights=_tuple_or_empty(self._extract_insights(content))
         )
         
         self.thoughts.append(thought)
+        if self._thought_db is not None:
+            self._enqueue_thought(thought)
         self.logger.info(f"Metacognitive thought: {thought_type.value} - {content[:100]}...")
         
         return thought
     
+    def _open_thought_store(self):
+        """Open the append-only SQLite store used for cold thoughts"""
+        try:
+            self._thought_db = sqlite3.connect(self.thought_db_path, isolation_level=None)
+            self._thought_db.execute("PRAGMA journal_mode=WAL")
+            self._thought_db.execute("PRAGMA synchronous=NORMAL")
+            self._thought_db.executescript(_THOUGHT_SCHEMA)
+        except Exception as e:
+            self.logger.error(f"Failed to open thought store {self.thought_db_path}: {e}")
+            self._thought_db = None
+            self.thoughts = deque(self.thoughts)
+    
+    def _enqueue_thought(self, thought: MetacognitiveThought):
+        """Queue a thought for the background writer without blocking the caller"""
+        if self._thought_writer is None:
+            self._thought_wakeup = asyncio.Event()
+            self._thought_writer = asyncio.create_task(self._thought_writer_loop())
+        self._thought_rows.append((
+            _ns_to_ts(thought.timestamp_ns),
+            thought.thought_type.value,
+            thought.content,
+            json.dumps(thought.context, default=str),
+            thought.confidence
+        ))
+        if len(self._thought_rows) >= _THOUGHT_FLUSH_BATCH:
+            self._thought_wakeup.set()
+    
+    async def _thought_writer_loop(self):
+        """Write queued thoughts to SQLite once a batch fills up, or after a short interval"""
+        while True:
+            try:
+                await asyncio.wait_for(self._thought_wakeup.wait(), _THOUGHT_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._thought_wakeup.clear()
+            self._write_queued_thoughts()
+    
+    def _write_queued_thoughts(self):
+        """Write and clear the queued thought rows"""
+        rows, self._thought_rows = self._thought_rows, []
+        try:
+            self._write_thought_rows(rows)
+        except Exception as e:
+            self.logger.error(f"Error in thought writer: {e}")
+    
+    def _write_thought_rows(self, rows: List[Tuple]):
+        """Insert a batch of thought rows in a single transaction"""
+        if not rows or self._thought_db is None:
+            return
+        with self._thought_db:
+            self._thought_db.execute("BEGIN")
+            self._thought_db.executemany(
+                "INSERT INTO thoughts(ts, type, content, context, conf) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+    
+    async def flush_thoughts(self):
+        """Persist any queued thoughts and stop the background writer"""
+        if self._thought_writer is not None:
+            self._thought_writer.cancel()
+            try:
+                await self._thought_writer
+            except asyncio.CancelledError:
+                pass
+            self._thought_writer = None
+            self._thought_wakeup = None
+        self._write_queued_thoughts()
+    
+    def _load_cold_thoughts(self, thought_type: ReflectionType, before: float) -> List[MetacognitiveThought]:
+        """Load thoughts of a type older than the hot window from SQLite and the writer's queue"""
+        rows = self._thought_db.execute(
+            "SELECT ts, content, context, conf FROM thoughts WHERE type = ? AND ts < ? ORDER BY ts DESC",
+            (thought_type.value, before)
+        ).fetchall()
+        rows.reverse()
+        # Queued rows are newer than anything already written
+        rows += [(ts, content, context, conf) for ts, kind, content, context, conf in self._thought_rows
+                 if kind == thought_type.value and ts < before]
+        return [
+            MetacognitiveThought(
+                timestamp_ns=int((ts - _BOOT_WALL_TS) * 1e9),
+                thought_type=thought_type,
+                content=content,
+                context=json.loads(context) if context else {},
+                confidence=conf,
+                action_items=_tuple_or_empty(self._extract_action_items(content)),
+                insights=_tuple_or_empty(self._extract_insights(content))
+            )
+            for ts, content, context, conf in rows
+        ]
+    
     async def reflect_on_task(self, task_id: str, task_description: str) -> MetacognitiveThought:
         """Reflect on a specific task's progress and status"""
         if task_id not in self.task_progress:
@@ -118,7 +410,7 @@ class MetacognitionEngine:
         
         progress = self.task_progress[task_id]
         
-        reflection_content = f"""
+        reflection_content = lambda: f"""
         Task Reflection for '{task_description}':
         
         Current Status:
@@ -147,20 +439,18 @@ class MetacognitionEngine:
     
     async def reflect_on_progress(self) -> MetacognitiveThought:
         """Reflect on overall orchestration progress"""
-        total_tasks = len(self.task_progress)
-        active_tasks = len([t for t in self.task_progress.values() if t.status == "active"])
-        completed_tasks = len([t for t in self.task_progress.values() if t.status == "completed"])
-        
-        avg_completion = sum(t.completion_percentage for t in self.task_progress.values()) / max(total_tasks, 1)
+        snap = await self._run_in_executor(
+            _compute_progress_snapshot, self._progress_snapshot(), dict(self._status_counter)
+        )
         
-        reflection_content = f"""
+        reflection_content = lambda: f"""
         Overall Progress Reflection:
         
         System Status:
-        - Total tasks: {total_tasks}
-        - Active tasks: {active_tasks}
-        - Completed tasks: {completed_tasks}
-        - Average completion: {avg_completion:.1f}%
+        - Total tasks: {snap.total_tasks}
+        - Active tasks: {snap.active_tasks}
+        - Completed tasks: {snap.completed_tasks}
+        - Average completion: {snap.avg_completion:.1f}%
         
         Agent Performance:
         - Available agents: {len(self.orchestration_state.available_agents)}
@@ -176,7 +466,7 @@ class MetacognitionEngine:
         return await self.think(
             ReflectionType.PROGRESS_EVALUATION,
             reflection_content,
-            {"total_tasks": total_tasks, "active_tasks": active_tasks, "avg_completion": avg_completion}
+            {"total_tasks": snap.total_tasks, "active_tasks": snap.active_tasks, "avg_completion": snap.avg_completion}
         )
     
     async def reflect_on_strategy(self, current_strategy: str, outcomes: List[Dict[str, Any]]) -> MetacognitiveThought:
@@ -184,7 +474,7 @@ class MetacognitionEngine:
         success_rate = len([o for o in outcomes if o.get("success", False)]) / max(len(outcomes), 1)
         avg_duration = sum(o.get("duration", 0) for o in outcomes) / max(len(outcomes), 1)
         
-        reflection_content = f"""
+        reflection_content = lambda: f"""
         Strategy Reflection:
         
         Current Strategy: {current_strategy}
@@ -214,7 +504,7 @@ class MetacognitionEngine:
         avg_response_time = performance_data.get("avg_response_time", 0)
         total_tasks = performance_data.get("total_tasks", 0)
         
-        reflection_content = f"""
+        reflection_content = lambda: f"""
         Agent Performance Reflection:
         
         Agent: {agent_name}
@@ -240,23 +530,18 @@ class MetacognitionEngine:
     
     async def analyze_bottlenecks(self) -> MetacognitiveThought:
         """Analyze system bottlenecks and constraints"""
-        bottlenecks = []
-        for task in self.task_progress.values():
-            bottlenecks.extend(task.bottlenecks)
+        snap = await self._run_in_executor(_compute_bottleneck_snapshot, self._progress_snapshot())
         
-        unique_bottlenecks = list(set(bottlenecks))
-        bottleneck_frequency = {b: bottlenecks.count(b) for b in unique_bottlenecks}
-        
-        reflection_content = f"""
+        reflection_content = lambda: f"""
         Bottleneck Analysis:
         
         Identified Bottlenecks:
-        {chr(10).join(f"- {b}: {freq} occurrences" for b, freq in bottleneck_frequency.items())}
+        {snap.bottleneck_lines}
         
         Analysis:
-        - Most common bottleneck: {max(bottleneck_frequency.items(), key=lambda x: x[1])[0] if bottleneck_frequency else "None"}
-        - Total bottleneck instances: {len(bottlenecks)}
-        - Unique bottleneck types: {len(unique_bottlenecks)}
+        - Most common bottleneck: {snap.most_common}
+        - Total bottleneck instances: {snap.total_instances}
+        - Unique bottleneck types: {snap.unique_types}
         
         Recommendations:
         - How can we address the most common bottlenecks?
@@ -268,7 +553,7 @@ class MetacognitionEngine:
         return await self.think(
             ReflectionType.BOTTLENECK_ANALYSIS,
             reflection_content,
-            {"bottlenecks": bottleneck_frequency, "total_instances": len(bottlenecks)}
+            {"bottlenecks": snap.bottleneck_frequency, "total_instances": snap.total_instances}
         )
     
     async def assess_completion(self, task_id: str) -> MetacognitiveThought:
@@ -277,12 +562,12 @@ class MetacognitionEngine:
             return None
         
         progress = self.task_progress[task_id]
-        completion_threshold = float(os.getenv("TASK_COMPLETION_THRESHOLD", "0.95"))
+        completion_threshold = self.cfg.threshold
         
         is_complete = progress.completion_percentage >= completion_threshold
         quality_score = self._assess_task_quality(progress)
         
-        reflection_content = f"""
+        reflection_content = lambda: f"""
         Task Completion Assessment:
         
         Task: {progress.task_description}
@@ -308,38 +593,51 @@ class MetacognitionEngine:
             {"task_id": task_id, "is_complete": is_complete, "quality_score": quality_score}
         )
     
-    def update_task_progress(self, task_id: str, current_step: int, total_steps: int, status: str, 
-                           completion_percentage: float, bottlenecks: List[str] = None, 
-                           successes: List[str] = None, failures: List[str] = None):
+    def _progress_snapshot(self) -> Tuple[TaskProgress, ...]:
+        """Freeze the current task progress view so aggregation can run without locks"""
+        return tuple(self.task_progress.values())
+    
+    async def _run_in_executor(self, func, *args):
+        """Run pure aggregation work on the bounded reflection pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_REFLECTION_EXECUTOR, func, *args)
+    
+    async def update_task_progress(self, task_id: str, current_step: int, total_steps: int, status: str, 
+                                 completion_percentage: float, bottlenecks: List[str] = None, 
+                                 successes: List[str] = None, failures: List[str] = None):
         """Update progress for a specific task"""
-        if task_id not in self.task_progress:
-            self.task_progress[task_id] = TaskProgress(
-                task_id=task_id,
-                task_description="",
-                current_step=current_step,
-                total_steps=total_steps,
-                completion_percentage=completion_percentage,
-                status=status,
-                start_time=datetime.now(),
-                last_update=datetime.now(),
-                estimated_completion=None,
-                bottlenecks=bottlenecks or [],
-                successes=successes or [],
-                failures=failures or []
-            )
-        else:
-            progress = self.task_progress[task_id]
-            progress.current_step = current_step
-            progress.total_steps = total_steps
-            progress.completion_percentage = completion_percentage
-            progress.status = status
-            progress.last_update = datetime.now()
-            if bottlenecks:
-                progress.bottlenecks.extend(bottlenecks)
-            if successes:
-                progress.successes.extend(successes)
-            if failures:
-                progress.failures.extend(failures)
+        async with self._task_locks[task_id]:
+            if task_id not in self.task_progress:
+                self.task_progress[task_id] = TaskProgress(
+                    task_id=task_id,
+                    task_description="",
+                    current_step=current_step,
+                    total_steps=total_steps,
+                    completion_percentage=completion_percentage,
+                    status=status,
+                    start_time=datetime.now(),
+                    last_update_ns=time.monotonic_ns(),
+                    estimated_completion=None,
+                    bottlenecks=bottlenecks or [],
+                    successes=successes or [],
+                    failures=failures or []
+                )
+                self._status_counter[status] += 1
+            else:
+                progress = self.task_progress[task_id]
+                progress.current_step = current_step
+                progress.total_steps = total_steps
+                progress.completion_percentage = completion_percentage
+                self._status_counter[progress.status] -= 1
+                progress.status = status
+                self._status_counter[status] += 1
+                progress.last_update_ns = time.monotonic_ns()
+                if bottlenecks:
+                    progress.bottlenecks.extend(bottlenecks)
+                if successes:
+                    progress.successes.extend(successes)
+                if failures:
+                    progress.failures.extend(failures)
     
     def update_orchestration_state(self, active_tasks: List[str] = None, available_agents: List[str] = None,
                                  agent_performance: Dict[str, Dict[str, Any]] = None,
@@ -363,9 +661,25 @@ class MetacognitionEngine:
             try:
                 await asyncio.sleep(self.reflection_interval)
                 
-                # Perform periodic reflections
-                await self.reflect_on_progress()
-                await self.analyze_bottlenecks()
+                # Skip the tick rather than stacking reflections behind a slow one
+                if self._reflecting:
+                    self.logger.warning("Skipping reflection tick: previous still running")
+                    continue
+                
+                self._reflecting = True
+                try:
+                    # Perform periodic reflections
+                    results = await asyncio.gather(
+                        self.reflect_on_progress(),
+                        self.analyze_bottlenecks(),
+                        return_exceptions=True
+                    )
+                finally:
+                    self._reflecting = False
+                
+                for result in results:
+                    if isinstance(result, Exception):
+                        self.logger.error(f"Error in periodic reflection: {result}")
                 
                 self.orchestration_state.last_reflection = datetime.now()
                 
@@ -444,25 +758,57 @@ class MetacognitionEngine:
     
     def get_recent_thoughts(self, limit: int = 10) -> List[MetacognitiveThought]:
         """Get recent metacognitive thoughts"""
-        return sorted(self.thoughts, key=lambda x: x.timestamp, reverse=True)[:limit]
+        return sorted(self.thoughts, key=lambda x: x.timestamp_ns, reverse=True)[:limit]
     
     def get_thoughts_by_type(self, thought_type: ReflectionType) -> List[MetacognitiveThought]:
         """Get thoughts of a specific type"""
-        return [t for t in self.thoughts if t.thought_type == thought_type]
+        hot = [t for t in self.thoughts if t.thought_type == thought_type]
+        if self._thought_db is None or len(self.thoughts) < self.thoughts.maxlen:
+            return hot
+        
+        # Hot window is full, so older thoughts have been evicted to the store
+        try:
+            cold = self._load_cold_thoughts(thought_type, _ns_to_ts(self.thoughts[0].timestamp_ns))
+        except Exception as e:
+            self.logger.error(f"Failed to query thought store: {e}")
+            cold = []
+        return cold + hot
+    
+    @staticmethod
+    def _export_record(record: Dict[str, Any], field_name: str) -> Dict[str, Any]:
+        """Render a monotonic timestamp field as a datetime for export"""
+        record[field_name] = _ns_to_dt(record.pop(f"{field_name}_ns"))
+        return record
     
     def export_metacognition_data(self) -> Dict[str, Any]:
         """Export metacognition data for persistence"""
         return {
-            "thoughts": [asdict(t) for t in self.thoughts],
-            "task_progress": {k: asdict(v) for k, v in self.task_progress.items()},
+            "thoughts": [self._export_record(asdict(t), "timestamp") for t in self.thoughts],
+            "task_progress": {k: self._export_record(asdict(v), "last_update") for k, v in self.task_progress.items()},
             "orchestration_state": asdict(self.orchestration_state),
             "export_timestamp": datetime.now().isoformat()
         }
 
+    def _ensure_reflection_loop(self):
+        """Start the background reflection loop if it isn't running (needs a running event loop)"""
+        if self._reflection_task is None or self._reflection_task.done():
+            self._reflection_task = asyncio.create_task(self._reflection_loop())
+    
     async def start_reflection_loop(self):
-        """Start the background reflection loop. Call this from an async context."""
+        """Start the background reflection loop now rather than on the first thought"""
         if self.enabled:
-            asyncio.create_task(self._reflection_loop())
+            self._ensure_reflection_loop()
+    
+    async def stop_reflection_loop(self):
+        """Stop the background reflection loop"""
+        if self._reflection_task is None:
+            return
+        self._reflection_task.cancel()
+        try:
+            await self._reflection_task
+        except asyncio.CancelledError:
+            pass
+        self._reflection_task = None
 
 # Global metacognition engine instance
 metacognition_engine = MetacognitionEngine() 
\ No newline at end of file
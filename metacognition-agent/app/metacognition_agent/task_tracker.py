@@ -5,14 +5,71 @@ Maps orchestration steps to git commits for complete task history and progress t
 
 import os
 import git
-import json
+import orjson
+import pygit2
+import queue
+import shutil
+import threading
 import uuid
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple, Set, Iterable
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
 import logging
 
+# Commit cadences: one commit per task phase, one per mutation, or none
+AUTO_COMMIT_MODES = ("batched", "per-step", "off")
+
+# Step statuses after which a step no longer runs
+TERMINAL_STEP_STATUSES = ("completed", "failed", "timeout")
+
+# All task history lives on one branch; tasks are namespaced under tasks/<task_id>/
+TASK_BRANCH = "tasks"
+
+# Fields stored as ISO strings in task.json and the write-ahead log
+_TASK_DATETIME_FIELDS = ("created_at", "started_at", "completed_at")
+_STEP_DATETIME_FIELDS = ("start_time", "end_time")
+
+def _shallow_dict(obj) -> Dict[str, Any]:
+    """Dataclass fields as a dict that shares nested containers with the instance"""
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+@lru_cache(maxsize=4096)
+def _commit_info(repo: git.Repo, hexsha: str, with_files: bool = False) -> Tuple[str, str, str, Optional[List[str]]]:
+    """Message, author, timestamp and optionally changed files of a commit
+    
+    Commits are immutable, so results are cached; file lists need a diff against
+    the parent and are only computed when asked for.
+    """
+    commit = repo.commit(hexsha)
+    files = list(commit.stats.files.keys()) if with_files else None
+    return commit.message, commit.author.name, commit.committed_datetime.isoformat(), files
+
+def _parse_datetimes(data: Dict[str, Any], names: Iterable[str]) -> Dict[str, Any]:
+    """Convert ISO string values of the given keys back to datetimes, in place"""
+    for name in names:
+        if isinstance(data.get(name), str):
+            data[name] = datetime.fromisoformat(data[name])
+    return data
+
+def _dump_json(path: Path, data: Dict[str, Any]):
+    """Write data as indented JSON straight to a file descriptor
+    
+    orjson encodes datetimes natively; default=str only catches other stray types.
+    The file is swapped in by rename so the commit worker never stages a half-written
+    file. No fsync here: durability is left to the commit at the batch boundary.
+    """
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
 @dataclass
 class TaskStep:
     """Represents a single step in task execution"""
@@ -50,23 +107,87 @@ class TaskExecution:
     git_commits: List[str]
     steps: List[TaskStep]
     metadata: Dict[str, Any]
+    worktree_path: Optional[str] = None  # set while the task commits in its own worktree
+    
+    def progress_snapshot(self) -> Dict[str, Any]:
+        """Progress summary for external readers (formerly progress.json)"""
+        return {
+            "task_id": self.task_id,
+            "status": self.status,
+            "completion_percentage": self.completion_percentage,
+            "current_step": self.current_step,
+            "total_steps": self.total_steps
+        }
 
 class GitTaskTracker:
     """Git-based task tracking system"""
     
     def __init__(self, workspace_path: str = "./workspace"):
-        self.workspace_path = Path(workspace_path)
+        self.workspace_path = Path(workspace_path).resolve()
         self.workspace_path.mkdir(exist_ok=True)
         self.repo = None
         self.task_executions: Dict[str, TaskExecution] = {}
         self.commit_prefix = os.getenv("TASK_COMMIT_PREFIX", "[Orchestration]")
         self.auto_commit = os.getenv("AUTO_COMMIT_TASKS", "true").lower() == "true"
+        self.commit_mode = os.getenv("AUTO_COMMIT_MODE", "batched").lower() if self.auto_commit else "off"
+        
+        # Non-terminal step updates smaller than this many bytes wait for the next terminal write
+        self.persist_intermediate = os.getenv("PERSIST_INTERMEDIATE_STATES", "true").lower() == "true"
+        self.intermediate_state_bytes = int(os.getenv("INTERMEDIATE_STATE_MAX_BYTES", "4096"))
+        
+        # Tasks with in-memory changes not yet written/committed, and their changed steps by ID
+        self._dirty_tasks: Set[str] = set()
+        self._dirty_steps: Dict[str, Dict[str, TaskStep]] = {}
+        
+        # Serializable view of each task, kept in step with the dataclass on every mutation
+        self._task_dict_cache: Dict[str, Dict[str, Any]] = {}
+        
+        # step_id -> step lookup per task, so status updates don't scan task.steps
+        self._steps_index: Dict[str, Dict[str, TaskStep]] = {}
+        
+        # Per-task step counts by status, maintained incrementally so progress queries are O(1)
+        self._status_counts: Dict[str, Counter] = {}
+        
+        # Task IDs grouped by task status, so status filters don't scan every task
+        self.tasks_by_status: Dict[str, Set[str]] = {}
         
         # Setup logging
         self.logger = logging.getLogger("task_tracker")
+        if self.commit_mode not in AUTO_COMMIT_MODES:
+            self.logger.warning(f"Unknown AUTO_COMMIT_MODE '{self.commit_mode}', using 'batched'")
+            self.commit_mode = "batched"
         
         # Initialize git repository
         self._initialize_git_repo()
+        self._checkout_task_branch()
+        
+        # libgit2 handle for in-process commits; GitPython still handles setup, branches and history
+        self._git2 = pygit2.Repository(self.repo.working_dir) if self.repo else None
+        
+        # Optionally give each task its own worktree and branch, merged into the task branch on completion
+        self.worktree_isolation = os.getenv("WORKTREE_ISOLATION", "false").lower() == "true" and self.repo is not None
+        self._worktree_repos: Dict[str, pygit2.Repository] = {}
+        self._git_identity = (os.getenv("GIT_USER_NAME", "Orchestration Agent"),
+                              os.getenv("GIT_USER_EMAIL", "orchestration@example.com"))
+        
+        # Append-only log of mutations since task files were last written; replayed on startup
+        self._wal_path = self.workspace_path / ".tasks.wal"
+        self._load_tasks()
+        self._replay_wal()
+        self._wal = open(self._wal_path, "ab", buffering=0)
+        
+        # _lock guards in-memory task state for public mutators; _git_lock serializes index/commit access
+        self._lock = threading.RLock()
+        self._git_lock = threading.Lock()
+        
+        # Commits are made by a single background worker, in submission order
+        self._commit_queue: "queue.Queue[Tuple[str, str, List[str], List[TaskStep]]]" = queue.Queue()
+        self._commit_thread = threading.Thread(target=self._commit_worker, name="task-commits", daemon=True)
+        self._commit_thread.start()
+        
+        # Materialize anything recovered from the log so it can be truncated
+        for task_id in list(self._dirty_tasks):
+            self.flush(task_id, "Recover task state from log")
     
     def _initialize_git_repo(self):
         """Initialize or connect to git repository for task tracking"""
@@ -85,10 +206,9 @@ class GitTaskTracker:
                     self.logger.info(f"Initialized new task git repo at: {self.workspace_path}")
                 
                 # Configure git user
-                self.repo.config_writer().set_value("user", "name", 
-                    os.getenv("GIT_USER_NAME", "Orchestration Agent")).release()
-                self.repo.config_writer().set_value("user", "email", 
-                    os.getenv("GIT_USER_EMAIL", "orchestration@example.com")).release()
+                with self.repo.config_writer() as config:
+                    config.set_value("user", "name", os.getenv("GIT_USER_NAME", "Orchestration Agent"))
+                    config.set_value("user", "email", os.getenv("GIT_USER_EMAIL", "orchestration@example.com"))
                 
                 # Create initial commit
                 self._create_initial_commit()
@@ -97,6 +217,18 @@ class GitTaskTracker:
             self.logger.error(f"Git initialization failed: {e}")
             self.repo = None
     
+    def _checkout_task_branch(self):
+        """Switch once to the long-lived task branch, creating it if needed"""
+        if not self.repo:
+            return
+        try:
+            if self.repo.head.is_valid() and self.repo.active_branch.name != TASK_BRANCH:
+                branch = self.repo.heads[TASK_BRANCH] if TASK_BRANCH in self.repo.heads else self.repo.create_head(TASK_BRANCH)
+                branch.checkout()
+                self.logger.info(f"Using task branch: {TASK_BRANCH}")
+        except Exception as e:
+            self.logger.error(f"Failed to switch to task branch: {e}")
+    
     def _create_initial_commit(self):
         """Create initial commit for the task repository"""
         try:
@@ -131,306 +263,596 @@ Each commit represents a step in task execution, providing a complete audit trai
     def create_task(self, task_description: str, user_request: str, 
                    estimated_steps: int = 10) -> str:
         """Create a new task execution"""
-        task_id = str(uuid.uuid4())
-        
-        # Create task branch
-        branch_name = f"task/{task_id[:8]}"
-        if self.repo:
-            try:
-                # Create and checkout new branch
-                new_branch = self.repo.create_head(branch_name)
-                new_branch.checkout()
-                self.logger.info(f"Created task branch: {branch_name}")
-            except Exception as e:
-                self.logger.error(f"Failed to create task branch: {e}")
-                branch_name = "main"
-        
-        # Create task execution record
-        task_execution = TaskExecution(
-            task_id=task_id,
-            task_description=task_description,
-            user_request=user_request,
-            created_at=datetime.now(),
-            started_at=None,
-            completed_at=None,
-            status="pending",
-            total_steps=estimated_steps,
-            completed_steps=0,
-            current_step=0,
-            completion_percentage=0.0,
-            git_branch=branch_name,
-            git_commits=[],
-            steps=[],
-            metadata={
-                "estimated_steps": estimated_steps,
-                "created_by": "metacognition_agent"
-            }
-        )
-        
-        self.task_executions[task_id] = task_execution
-        
-        # Create task directory and files
-        self._create_task_files(task_id, task_execution)
-        
-        # Commit task creation
-        if self.auto_commit and self.repo:
-            self._commit_task_creation(task_id, task_execution)
-        
-        self.logger.info(f"Created task: {task_id} - {task_description}")
-        return task_id
+        with self._lock:
+            task_id = str(uuid.uuid4())
+            
+            # Create task execution record
+            task_execution = TaskExecution(
+                task_id=task_id,
+                task_description=task_description,
+                user_request=user_request,
+                created_at=datetime.now(),
+                started_at=None,
+                completed_at=None,
+                status="pending",
+                total_steps=estimated_steps,
+                completed_steps=0,
+                current_step=0,
+                completion_percentage=0.0,
+                git_branch=TASK_BRANCH,
+                git_commits=[],
+                steps=[],
+                metadata={
+                    "estimated_steps": estimated_steps,
+                    "created_by": "metacognition_agent"
+                }
+            )
+            
+            if self.worktree_isolation:
+                self._add_worktree(task_execution)
+            
+            self._register_task(task_execution)
+            self._wal_append({"t": task_id, "op": "create", "f": self._task_dict_cache[task_id]})
+            
+            # Create task directory and files
+            changed_paths = self._create_task_files(task_id, task_execution)
+            
+            # Commit task creation
+            if self.commit_mode != "off" and self.repo:
+                self._commit_task_creation(task_id, task_execution, changed_paths)
+            
+            self.logger.info(f"Created task: {task_id} - {task_description}")
+            return task_id
     
     def start_task(self, task_id: str) -> bool:
         """Start task execution"""
-        if task_id not in self.task_executions:
-            return False
-        
-        task = self.task_executions[task_id]
-        task.status = "planning"
-        task.started_at = datetime.now()
-        
-        # Update task files
-        self._update_task_files(task_id, task)
-        
-        # Commit task start
-        if self.auto_commit and self.repo:
-            self._commit_task_update(task_id, "Start task execution", task)
-        
-        self.logger.info(f"Started task: {task_id}")
-        return True
+        with self._lock:
+            if task_id not in self.task_executions:
+                return False
+            
+            task = self.task_executions[task_id]
+            task.status = "planning"
+            task.started_at = datetime.now()
+            self._sync_task_dict(task, "status", "started_at")
+            
+            # Task start is a phase boundary: always write and commit
+            self._mark_dirty(task_id)
+            self.flush(task_id, "Start task execution")
+            
+            self.logger.info(f"Started task: {task_id}")
+            return True
     
     def add_task_step(self, task_id: str, step_description: str, agent_name: str, 
-                     action_type: str, parameters: Dict[str, Any] = None) -> str:
-        """Add a new step to a task"""
-        if task_id not in self.task_executions:
-            return None
-        
-        task = self.task_executions[task_id]
-        step_id = str(uuid.uuid4())
-        
-        # Create step record
-        step = TaskStep(
-            step_id=step_id,
-            task_id=task_id,
-            step_number=len(task.steps) + 1,
-            step_description=step_description,
-            agent_name=agent_name,
-            action_type=action_type,
-            parameters=parameters or {},
-            result={},
-            status="pending",
-            start_time=datetime.now(),
-            end_time=None,
-            duration=None,
-            git_commit_hash=None,
-            dependencies=[],
-            metadata={}
-        )
-        
-        task.steps.append(step)
-        task.total_steps = len(task.steps)
-        
-        # Update task files
-        self._update_task_files(task_id, task)
-        
-        # Commit step addition
-        if self.auto_commit and self.repo:
-            self._commit_task_update(task_id, f"Add step {step.step_number}: {step_description}", task)
-        
-        self.logger.info(f"Added step {step.step_number} to task {task_id}: {step_description}")
-        return step_id
+                     action_type: str, parameters: Dict[str, Any] = None,
+                     dependencies: List[str] = None) -> str:
+        """Add a new step to a task, optionally depending on earlier step IDs"""
+        with self._lock:
+            if task_id not in self.task_executions:
+                return None
+            
+            task = self.task_executions[task_id]
+            step_id = str(uuid.uuid4())
+            
+            # Create step record
+            step = TaskStep(
+                step_id=step_id,
+                task_id=task_id,
+                step_number=len(task.steps) + 1,
+                step_description=step_description,
+                agent_name=agent_name,
+                action_type=action_type,
+                parameters=parameters or {},
+                result={},
+                status="pending",
+                start_time=datetime.now(),
+                end_time=None,
+                duration=None,
+                git_commit_hash=None,
+                dependencies=list(dependencies or []),
+                metadata={}
+            )
+            
+            task.steps.append(step)
+            task.total_steps = len(task.steps)
+            self._steps_index[task_id][step_id] = step
+            self._status_counts[task_id][step.status] += 1
+            
+            task_dict = self._task_dict_cache[task_id]
+            task_dict["steps"].append(_shallow_dict(step))
+            task_dict["total_steps"] = task.total_steps
+            self._wal_append({"t": task_id, "op": "step_add", "f": task_dict["steps"][-1]})
+            
+            self._mark_dirty(task_id, step)
+            self._autoflush(task_id, f"Add step {step.step_number}: {step_description}")
+            
+            self.logger.info(f"Added step {step.step_number} to task {task_id}: {step_description}")
+            return step_id
     
     def update_step_status(self, task_id: str, step_id: str, status: str, 
                           result: Dict[str, Any] = None, metadata: Dict[str, Any] = None) -> bool:
         """Update the status of a task step"""
-        if task_id not in self.task_executions:
-            return False
-        
-        task = self.task_executions[task_id]
-        step = next((s for s in task.steps if s.step_id == step_id), None)
-        
-        if not step:
-            return False
-        
-        step.status = status
-        if result:
-            step.result.update(result)
-        if metadata:
-            step.metadata.update(metadata)
-        
-        if status in ["completed", "failed"]:
-            step.end_time = datetime.now()
-            step.duration = (step.end_time - step.start_time).total_seconds()
+        with self._lock:
+            if task_id not in self.task_executions:
+                return False
             
-            # Update completion percentage
-            completed_steps = len([s for s in task.steps if s.status == "completed"])
-            task.completed_steps = completed_steps
-            task.completion_percentage = (completed_steps / len(task.steps)) * 100 if task.steps else 0
+            task = self.task_executions[task_id]
+            step = self._steps_index[task_id].get(step_id)
             
-            # Check if task is complete
-            if completed_steps == len(task.steps):
-                task.status = "completed"
-                task.completed_at = datetime.now()
-        
-        # Update task files
-        self._update_task_files(task_id, task)
-        
-        # Commit step update
-        if self.auto_commit and self.repo:
+            if not step:
+                return False
+            
+            # Track completions as a running count: +1 on entering completed, -1 when a completed step is retried
+            completed_delta = (status == "completed") - (step.status == "completed")
+            counts = self._status_counts[task_id]
+            counts[step.status] -= 1
+            counts[status] += 1
+            step.status = status
+            if result:
+                step.result.update(result)
+            if metadata:
+                step.metadata.update(metadata)
+            
+            if completed_delta:
+                task.completed_steps += completed_delta
+                task.completion_percentage = (task.completed_steps / len(task.steps)) * 100 if task.steps else 0
+                self._sync_task_dict(task, "completed_steps", "completion_percentage")
+            
+            if status in TERMINAL_STEP_STATUSES:
+                now = datetime.now()
+                step.end_time = now
+                step.duration = (step.end_time - step.start_time).total_seconds()
+                
+                # Check if task is complete
+                if task.completed_steps == len(task.steps):
+                    task.status = "completed"
+                    task.completed_at = now
+                    self._sync_task_dict(task, "status", "completed_at")
+            
+            self._sync_step_dict(step, "status", "end_time", "duration", "result", "metadata")
+            self._mark_dirty(task_id, step)
             commit_message = f"Step {step.step_number} {status}: {step.step_description}"
-            self._commit_task_update(task_id, commit_message, task)
-            step.git_commit_hash = self.repo.head.commit.hexsha
-        
-        self.logger.info(f"Updated step {step.step_number} status to {status} for task {task_id}")
-        return True
+            if task.status == "completed":
+                # Last step finished: closure phase boundary
+                self.flush(task_id, commit_message)
+            elif status in TERMINAL_STEP_STATUSES or self._persist_step_update(result, metadata):
+                self._autoflush(task_id, commit_message)
+            
+            self.logger.info(f"Updated step {step.step_number} status to {status} for task {task_id}")
+            return True
     
     def complete_task(self, task_id: str, final_result: Dict[str, Any] = None) -> bool:
         """Mark a task as completed"""
-        if task_id not in self.task_executions:
-            return False
-        
-        task = self.task_executions[task_id]
-        task.status = "completed"
-        task.completed_at = datetime.now()
-        task.completion_percentage = 100.0
-        
-        if final_result:
-            task.metadata["final_result"] = final_result
-        
-        # Update task files
-        self._update_task_files(task_id, task)
-        
-        # Commit task completion
-        if self.auto_commit and self.repo:
-            self._commit_task_update(task_id, "Complete task execution", task)
+        with self._lock:
+            if task_id not in self.task_executions:
+                return False
+            
+            task = self.task_executions[task_id]
+            task.status = "completed"
+            task.completed_at = datetime.now()
+            task.completion_percentage = 100.0
+            
+            if final_result:
+                task.metadata["final_result"] = final_result
+            self._sync_task_dict(task, "status", "completed_at", "completion_percentage", "metadata")
+            
+            self._mark_dirty(task_id)
+            self.flush(task_id, "Complete task execution")
+            
+            self.logger.info(f"Completed task: {task_id}")
         
-        self.logger.info(f"Completed task: {task_id}")
+        self._merge_worktree(task_id)
         return True
     
     def fail_task(self, task_id: str, error_message: str, error_details: Dict[str, Any] = None) -> bool:
         """Mark a task as failed"""
-        if task_id not in self.task_executions:
-            return False
-        
-        task = self.task_executions[task_id]
-        task.status = "failed"
-        task.completed_at = datetime.now()
-        
-        task.metadata["error"] = {
-            "message": error_message,
-            "details": error_details or {},
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Update task files
-        self._update_task_files(task_id, task)
-        
-        # Commit task failure
-        if self.auto_commit and self.repo:
-            self._commit_task_update(task_id, f"Task failed: {error_message}", task)
+        with self._lock:
+            if task_id not in self.task_executions:
+                return False
+            
+            task = self.task_executions[task_id]
+            now = datetime.now()
+            task.status = "failed"
+            task.completed_at = now
+            
+            task.metadata["error"] = {
+                "message": error_message,
+                "details": error_details or {},
+                "timestamp": now.isoformat()
+            }
+            self._sync_task_dict(task, "status", "completed_at", "metadata")
+            
+            self._mark_dirty(task_id)
+            self.flush(task_id, f"Task failed: {error_message}")
+            
+            self.logger.error(f"Failed task: {task_id} - {error_message}")
         
-        self.logger.error(f"Failed task: {task_id} - {error_message}")
+        self._merge_worktree(task_id)
         return True
     
-    def _create_task_files(self, task_id: str, task: TaskExecution):
-        """Create files for task tracking"""
-        task_dir = self.workspace_path / "tasks" / task_id
+    def _add_worktree(self, task: TaskExecution):
+        """Create a worktree on a new per-task branch for an isolated task"""
+        branch_name = f"task/{task.task_id[:8]}"
+        worktree_path = self.workspace_path / ".worktrees" / task.task_id[:8]
+        try:
+            with self._git_lock:
+                # --no-track skips the upstream config write, so no .git/config.lock contention
+                self.repo.git.worktree("add", "--no-track", "-b", branch_name, str(worktree_path), TASK_BRANCH)
+            task.git_branch = branch_name
+            task.worktree_path = str(worktree_path)
+            self.logger.info(f"Created task worktree: {worktree_path} on {branch_name}")
+        except Exception as e:
+            self.logger.error(f"Failed to create task worktree, using the shared task branch: {e}")
+    
+    def _merge_worktree(self, task_id: str):
+        """Merge a finished isolated task back into the task branch and remove its worktree"""
+        task = self.task_executions.get(task_id)
+        if not task or not task.worktree_path:
+            return
+        
+        # The worker needs the tracker lock for bookkeeping, so drain it before taking the lock
+        self.flush_commits()
+        with self._lock:
+            try:
+                with self._git_lock:
+                    self.repo.git.merge("--no-ff", "-m", f"{self.commit_prefix} Merge task {task_id[:8]}", task.git_branch)
+                    self.repo.git.worktree("remove", "--force", task.worktree_path)
+                    self.repo.git.branch("-d", task.git_branch)
+                    self._worktree_repos.pop(task_id, None)
+            except Exception as e:
+                self.logger.error(f"Failed to merge task worktree {task.worktree_path}: {e}")
+                return
+            
+            task.git_branch = TASK_BRANCH
+            task.worktree_path = None
+            self._sync_task_dict(task, "git_branch", "worktree_path")
+    
+    def _task_dir(self, task_id: str) -> Path:
+        """Directory holding a task's files, inside its worktree when isolated"""
+        worktree_path = self.task_executions[task_id].worktree_path
+        return (Path(worktree_path) if worktree_path else self.workspace_path) / "tasks" / task_id
+    
+    def _git2_for(self, task_id: str) -> pygit2.Repository:
+        """libgit2 repository a task commits into: its worktree when isolated, else the shared one"""
+        task = self.task_executions[task_id]
+        if not task.worktree_path:
+            return self._git2
+        if task_id not in self._worktree_repos:
+            self._worktree_repos[task_id] = pygit2.Repository(task.worktree_path)
+        return self._worktree_repos[task_id]
+    
+    def _create_task_files(self, task_id: str, task: TaskExecution) -> List[str]:
+        """Create files for task tracking, returning the paths written"""
+        task_dir = self._task_dir(task_id)
         task_dir.mkdir(parents=True, exist_ok=True)
         
         # Create task metadata file
         metadata_file = task_dir / "task.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(asdict(task), f, indent=2, default=str)
+        _dump_json(metadata_file, self._task_dict_cache[task_id])
         
         # Create steps directory
         steps_dir = task_dir / "steps"
         steps_dir.mkdir(exist_ok=True)
         
-        # Create progress file
-        progress_file = task_dir / "progress.json"
-        progress_data = {
-            "task_id": task_id,
-            "status": task.status,
-            "completion_percentage": task.completion_percentage,
-            "current_step": task.current_step,
-            "total_steps": task.total_steps,
-            "last_update": datetime.now().isoformat()
-        }
-        with open(progress_file, 'w') as f:
-            json.dump(progress_data, f, indent=2, default=str)
+        return [str(metadata_file)]
+    
+    def _sync_task_dict(self, task: TaskExecution, *field_names: str, log: bool = True):
+        """Copy reassigned task fields into the cached task dict and the write-ahead log"""
+        task_dict = self._task_dict_cache[task.task_id]
+        if "status" in field_names and task_dict["status"] != task.status:
+            self.tasks_by_status[task_dict["status"]].discard(task.task_id)
+            self.tasks_by_status.setdefault(task.status, set()).add(task.task_id)
+        for name in field_names:
+            task_dict[name] = getattr(task, name)
+        if log:
+            self._wal_append({"t": task.task_id, "op": "task", "f": {name: task_dict[name] for name in field_names}})
+    
+    def _sync_step_dict(self, step: TaskStep, *field_names: str, log: bool = True):
+        """Copy reassigned step fields into the cached step dict and the write-ahead log"""
+        step_dict = self._task_dict_cache[step.task_id]["steps"][step.step_number - 1]
+        for name in field_names:
+            step_dict[name] = getattr(step, name)
+        if log:
+            self._wal_append({"t": step.task_id, "op": "step", "s": step.step_number,
+                              "f": {name: step_dict[name] for name in field_names}})
+    
+    def _register_task(self, task: TaskExecution):
+        """Add a task to the in-memory tables and build its cached dict and step index"""
+        self.task_executions[task.task_id] = task
+        self._task_dict_cache[task.task_id] = {**_shallow_dict(task), "steps": [_shallow_dict(s) for s in task.steps]}
+        self._steps_index[task.task_id] = {s.step_id: s for s in task.steps}
+        self._status_counts[task.task_id] = Counter(s.status for s in task.steps)
+        self.tasks_by_status.setdefault(task.status, set()).add(task.task_id)
+    
+    def _task_from_dict(self, data: Dict[str, Any]) -> TaskExecution:
+        """Rebuild a task execution from its task.json / log representation"""
+        steps = [TaskStep(**_parse_datetimes(dict(s), _STEP_DATETIME_FIELDS)) for s in data.get("steps", [])]
+        return TaskExecution(**{**_parse_datetimes(dict(data), _TASK_DATETIME_FIELDS), "steps": steps})
+    
+    def _load_tasks(self):
+        """Load tasks materialized in task.json files, including those in task worktrees"""
+        metadata_files = list((self.workspace_path / "tasks").glob("*/task.json"))
+        metadata_files += (self.workspace_path / ".worktrees").glob("*/tasks/*/task.json")
+        for metadata_file in metadata_files:
+            try:
+                task = self._task_from_dict(orjson.loads(metadata_file.read_bytes()))
+                if task.worktree_path and not Path(task.worktree_path).exists():
+                    # Written just before its worktree was merged back and removed
+                    task.worktree_path = None
+                    task.git_branch = TASK_BRANCH
+                self._register_task(task)
+            except Exception as e:
+                self.logger.error(f"Failed to load task from {metadata_file}: {e}")
     
-    def _update_task_files(self, task_id: str, task: TaskExecution):
-        """Update task tracking files"""
-        task_dir = self.workspace_path / "tasks" / task_id
+    def _wal_append(self, event: Dict[str, Any]):
+        """Append a length-prefixed event record to the write-ahead log"""
+        payload = orjson.dumps(event, default=str)
+        self._wal.write(len(payload).to_bytes(4, "little") + payload)
+    
+    def _replay_wal(self):
+        """Re-apply logged mutations on top of the loaded task files"""
+        if not self._wal_path.exists():
+            return
+        
+        data = self._wal_path.read_bytes()
+        offset = replayed = 0
+        while offset + 4 <= len(data):
+            length = int.from_bytes(data[offset:offset + 4], "little")
+            record = data[offset + 4:offset + 4 + length]
+            if len(record) < length:
+                # Torn write at the tail from a crash mid-append
+                break
+            offset += 4 + length
+            try:
+                self._apply_event(orjson.loads(record))
+                replayed += 1
+            except Exception as e:
+                self.logger.error(f"Skipping unreadable task log record: {e}")
+        
+        if replayed:
+            self.logger.info(f"Replayed {replayed} task log records")
+    
+    def _apply_event(self, event: Dict[str, Any]):
+        """Apply one write-ahead log event to in-memory state and mark it for writing"""
+        task_id, op, values = event["t"], event["op"], event.get("f", {})
+        if op == "remove":
+            task = self.task_executions.pop(task_id, None)
+            if task:
+                self.tasks_by_status[task.status].discard(task_id)
+            self._task_dict_cache.pop(task_id, None)
+            self._steps_index.pop(task_id, None)
+            self._status_counts.pop(task_id, None)
+            return
+        if op == "create":
+            if task_id not in self.task_executions:
+                self._register_task(self._task_from_dict(values))
+            self._mark_dirty(task_id)
+            return
+        
+        task = self.task_executions.get(task_id)
+        if not task:
+            return
+        
+        if op == "step_add":
+            if values["step_number"] > len(task.steps):
+                step = TaskStep(**_parse_datetimes(dict(values), _STEP_DATETIME_FIELDS))
+                task.steps.append(step)
+                self._steps_index[task_id][step.step_id] = step
+                self._status_counts[task_id][step.status] += 1
+                self._task_dict_cache[task_id]["steps"].append(_shallow_dict(step))
+            self._mark_dirty(task_id, task.steps[values["step_number"] - 1])
+        elif op == "task":
+            for name, value in _parse_datetimes(values, _TASK_DATETIME_FIELDS).items():
+                setattr(task, name, value)
+            self._sync_task_dict(task, *values, log=False)
+            self._mark_dirty(task_id)
+        elif op == "step":
+            step = task.steps[event["s"] - 1]
+            if "status" in values:
+                self._status_counts[task_id][step.status] -= 1
+                self._status_counts[task_id][values["status"]] += 1
+            for name, value in _parse_datetimes(values, _STEP_DATETIME_FIELDS).items():
+                setattr(step, name, value)
+            self._sync_step_dict(step, *values, log=False)
+            self._mark_dirty(task_id, step)
+    
+    def _persist_step_update(self, result: Optional[Dict[str, Any]], metadata: Optional[Dict[str, Any]]) -> bool:
+        """Whether a non-terminal step update should be written now rather than with the next terminal one"""
+        if self.persist_intermediate:
+            return True
+        payload_size = sum(len(orjson.dumps(d, default=str)) for d in (result, metadata) if d)
+        return payload_size > self.intermediate_state_bytes
+    
+    def _mark_dirty(self, task_id: str, step: Optional[TaskStep] = None):
+        """Record that a task, and optionally one of its steps, has unsaved changes"""
+        self._dirty_tasks.add(task_id)
+        if step is not None:
+            self._dirty_steps.setdefault(task_id, {})[step.step_id] = step
+    
+    def _autoflush(self, task_id: str, message: str):
+        """Flush immediately unless commits are batched per task phase"""
+        if self.commit_mode != "batched":
+            self.flush(task_id, message)
+    
+    def flush(self, task_id: str, message: str) -> bool:
+        """Write pending changes for a task and commit them as a single update
+        
+        Called automatically at task start, completion and failure; callers can also
+        invoke it at their own phase boundaries (e.g. after planning all steps).
+        """
+        with self._lock:
+            if task_id not in self._dirty_tasks or task_id not in self.task_executions:
+                return False
+            
+            task = self.task_executions[task_id]
+            changed_steps = list(self._dirty_steps.pop(task_id, {}).values())
+            self._dirty_tasks.discard(task_id)
+            
+            changed_paths = self._update_task_files(task_id, task, changed_steps)
+            
+            if self.commit_mode != "off" and self.repo:
+                self._commit_task_update(task_id, message, task, changed_paths, changed_steps)
+            
+            self._truncate_wal_if_settled()
+            return True
+    
+    def _truncate_wal_if_settled(self):
+        """Empty the write-ahead log once every task's files are current and no commit is queued"""
+        with self._lock:
+            if not self._dirty_tasks and not self._commit_queue.unfinished_tasks:
+                self._wal.truncate(0)
+    
+    def _update_task_files(self, task_id: str, task: TaskExecution,
+                           changed_steps: Optional[Iterable[TaskStep]] = None) -> List[str]:
+        """Update task tracking files, rewriting only the changed steps when provided
+        
+        Returns the paths written so commits can stage exactly those files.
+        """
+        task_dir = self._task_dir(task_id)
         
         # Update task metadata
         metadata_file = task_dir / "task.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(asdict(task), f, indent=2, default=str)
-        
-        # Update progress
-        progress_file = task_dir / "progress.json"
-        progress_data = {
-            "task_id": task_id,
-            "status": task.status,
-            "completion_percentage": task.completion_percentage,
-            "current_step": task.current_step,
-            "total_steps": task.total_steps,
-            "last_update": datetime.now().isoformat()
-        }
-        with open(progress_file, 'w') as f:
-            json.dump(progress_data, f, indent=2, default=str)
+        task_dict = self._task_dict_cache[task_id]
+        _dump_json(metadata_file, task_dict)
+        changed_paths = [str(metadata_file)]
         
         # Update individual step files
         steps_dir = task_dir / "steps"
-        for step in task.steps:
-            step_file = steps_dir / f"step_{step.step_number:03d}.json"
-            with open(step_file, 'w') as f:
-                json.dump(asdict(step), f, indent=2, default=str)
+        for step in (task.steps if changed_steps is None else changed_steps):
+            step_file = self._write_step_file(steps_dir, step, task_dict["steps"][step.step_number - 1])
+            changed_paths.append(str(step_file))
+        
+        return changed_paths
     
-    def _commit_task_creation(self, task_id: str, task: TaskExecution):
-        """Commit task creation to git"""
-        try:
-            task_dir = self.workspace_path / "tasks" / task_id
-            self.repo.index.add([str(task_dir)])
-            
-            commit_message = f"{self.commit_prefix} Create task: {task.task_description[:50]}"
-            self.repo.index.commit(commit_message)
-            
-            task.git_commits.append(self.repo.head.commit.hexsha)
+    def _write_step_file(self, steps_dir: Path, step: TaskStep, step_dict: Dict[str, Any]) -> Path:
+        """Write a single step record"""
+        step_file = steps_dir / f"step_{step.step_number:03d}.json"
+        _dump_json(step_file, step_dict)
+        return step_file
+    
+    def _commit_task_creation(self, task_id: str, task: TaskExecution, changed_paths: List[str]):
+        """Queue the task creation commit"""
+        self._commit_queue.put((task_id, f"Create task: {task.task_description[:50]}", changed_paths, []))
+    
+    def _commit_task_update(self, task_id: str, message: str, task: TaskExecution,
+                            changed_paths: List[str], changed_steps: List[TaskStep] = None):
+        """Queue a task update commit, staging only the files written for it"""
+        self._commit_queue.put((task_id, message, changed_paths, changed_steps or []))
+    
+    def _commit_worker(self):
+        """Drain the commit queue, coalescing consecutive updates to the same task unless committing per step"""
+        pending = None
+        while True:
+            batch = [pending or self._commit_queue.get()]
+            pending = None
+            while pending is None:
+                try:
+                    item = self._commit_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item[0] == batch[0][0] and self.commit_mode != "per-step":
+                    batch.append(item)
+                else:
+                    pending = item
             
-        except Exception as e:
-            self.logger.error(f"Failed to commit task creation: {e}")
+            try:
+                self._commit_batch(batch)
+            finally:
+                for _ in batch:
+                    self._commit_queue.task_done()
+            self._truncate_wal_if_settled()
+    
+    def _commit_batch(self, batch: List[Tuple[str, str, List[str], List[TaskStep]]]):
+        """Commit a run of queued updates for one task and record the resulting hash"""
+        task_id = batch[0][0]
+        messages = [message for _, message, _, _ in batch]
+        changed_paths = list(dict.fromkeys(path for _, _, paths, _ in batch for path in paths))
+        
+        commit_message = f"{self.commit_prefix} {messages[-1]}"
+        if len(messages) > 1:
+            commit_message += "\n\n" + "\n".join(messages)
+        
+        commit_hash = self._write_commit(task_id, changed_paths, commit_message)
+        if not commit_hash:
+            return
+        
+        # Commit hashes are bookkeeping about the files just committed, not task mutations: they reach
+        # task.json with the task's next write and are not logged, or every commit would leave the
+        # log non-empty and a restart would replay it into yet another recovery commit
+        with self._lock:
+            task = self.task_executions.get(task_id)
+            if task:
+                task.git_commits.append(commit_hash)
+                self._sync_task_dict(task, "git_commits", log=False)
+            for _, _, _, steps in batch:
+                for step in steps:
+                    step.git_commit_hash = commit_hash
+                    if task:
+                        self._sync_step_dict(step, "git_commit_hash", log=False)
     
-    def _commit_task_update(self, task_id: str, message: str, task: TaskExecution):
-        """Commit task update to git"""
+    def _write_commit(self, task_id: str, changed_paths: List[str], commit_message: str) -> Optional[str]:
+        """Stage the given paths and commit them, returning the new commit's hash (None if nothing changed)"""
         try:
-            task_dir = self.workspace_path / "tasks" / task_id
-            self.repo.index.add([str(task_dir)])
-            
-            commit_message = f"{self.commit_prefix} {message}"
-            self.repo.index.commit(commit_message)
-            
-            task.git_commits.append(self.repo.head.commit.hexsha)
-            
+            with self._git_lock:
+                if task_id not in self.task_executions:
+                    # Removed by cleanup_old_tasks while queued
+                    return None
+                
+                git2 = self._git2_for(task_id)
+                index = git2.index
+                index.read()
+                for path in changed_paths:
+                    index.add(os.path.relpath(path, git2.workdir))
+                index.write()
+                
+                tree_id = index.write_tree()
+                parent = git2[git2.head.target]
+                if tree_id == parent.tree_id:
+                    # Rewritten files serialized to the same bytes; don't record an empty commit
+                    self.logger.debug(f"Skipping no-op commit for task {task_id}: {commit_message}")
+                    return None
+                
+                signature = pygit2.Signature(*self._git_identity)
+                commit_id = git2.create_commit("HEAD", signature, signature, commit_message,
+                                               tree_id, [parent.id])
+                return str(commit_id)
         except Exception as e:
             self.logger.error(f"Failed to commit task update: {e}")
+            return None
+    
+    def flush_commits(self):
+        """Block until all queued commits have been written"""
+        self._commit_queue.join()
     
     def get_task(self, task_id: str) -> Optional[TaskExecution]:
         """Get a task execution by ID"""
         return self.task_executions.get(task_id)
     
+    def get_step(self, task_id: str, step_id: str) -> Optional[TaskStep]:
+        """Get a task step by ID"""
+        return self._steps_index.get(task_id, {}).get(step_id)
+    
+    def status_counts(self, task_id: str) -> Dict[str, int]:
+        """Get the number of steps in each status for a task"""
+        return dict(+self._status_counts.get(task_id, Counter()))
+    
+    def step_count(self, task_id: str, *statuses: str) -> int:
+        """Get the number of a task's steps in any of the given statuses"""
+        counts = self._status_counts.get(task_id)
+        return sum(counts[status] for status in statuses) if counts else 0
+    
     def get_active_tasks(self) -> List[TaskExecution]:
         """Get all active tasks"""
-        return [t for t in self.task_executions.values() if t.status in ["pending", "planning", "executing"]]
+        return [self.task_executions[task_id] for status in ["pending", "planning", "executing"]
+                for task_id in self.tasks_by_status.get(status, ())]
     
     def get_completed_tasks(self, days: int = 30) -> List[TaskExecution]:
         """Get completed tasks from the last N days"""
         cutoff_date = datetime.now() - timedelta(days=days)
-        return [t for t in self.task_executions.values() 
-                if t.status == "completed" and t.completed_at and t.completed_at > cutoff_date]
+        completed = (self.task_executions[task_id] for task_id in self.tasks_by_status.get("completed", ()))
+        return [t for t in completed if t.completed_at and t.completed_at > cutoff_date]
     
-    def get_task_history(self, task_id: str) -> List[Dict[str, Any]]:
-        """Get git history for a specific task"""
+    def get_task_history(self, task_id: str, include_files: bool = False) -> List[Dict[str, Any]]:
+        """Get git history for a specific task, with per-commit file lists if include_files is set"""
         if not self.repo or task_id not in self.task_executions:
             return []
         
@@ -440,14 +862,16 @@ Each commit represents a step in task execution, providing a complete audit trai
         try:
             # Get commits for this task
             for commit_hash in task.git_commits:
-                commit = self.repo.commit(commit_hash)
-                history.append({
+                message, author, timestamp, files = _commit_info(self.repo, commit_hash, include_files)
+                entry = {
                     "commit_hash": commit_hash,
-                    "message": commit.message,
-                    "author": commit.author.name,
-                    "timestamp": commit.committed_datetime.isoformat(),
-                    "files_changed": list(commit.stats.files.keys())
-                })
+                    "message": message,
+                    "author": author,
+                    "timestamp": timestamp
+                }
+                if include_files:
+                    entry["files_changed"] = files
+                history.append(entry)
         except Exception as e:
             self.logger.error(f"Failed to get task history: {e}")
         
@@ -458,37 +882,55 @@ Each commit represents a step in task execution, providing a complete audit trai
         if task_id not in self.task_executions:
             return {}
         
-        task = self.task_executions[task_id]
         return {
-            "task": asdict(task),
+            "task": self._task_dict_cache[task_id],
             "history": self.get_task_history(task_id),
             "export_timestamp": datetime.now().isoformat()
         }
     
     def cleanup_old_tasks(self, days: int = None):
         """Clean up old task data"""
-        if days is None:
-            days = int(os.getenv("TASK_HISTORY_RETENTION_DAYS", "30"))
-        
-        cutoff_date = datetime.now() - timedelta(days=days)
-        tasks_to_remove = []
-        
-        for task_id, task in self.task_executions.items():
-            if task.completed_at and task.completed_at < cutoff_date:
-                tasks_to_remove.append(task_id)
-        
-        for task_id in tasks_to_remove:
-            # Remove task files
-            task_dir = self.workspace_path / "tasks" / task_id
-            if task_dir.exists():
-                import shutil
-                shutil.rmtree(task_dir)
+        with self._lock:
+            if days is None:
+                days = int(os.getenv("TASK_HISTORY_RETENTION_DAYS", "30"))
             
-            # Remove from memory
-            del self.task_executions[task_id]
-        
-        if tasks_to_remove:
-            self.logger.info(f"Cleaned up {len(tasks_to_remove)} old tasks")
+            cutoff_date = datetime.now() - timedelta(days=days)
+            tasks_to_remove = []
+            
+            for task_id, task in self.task_executions.items():
+                if task.completed_at and task.completed_at < cutoff_date:
+                    tasks_to_remove.append(task_id)
+            
+            for task_id in tasks_to_remove:
+                # Remove from memory first so the commit worker drops anything still queued for these tasks
+                self._wal_append({"t": task_id, "op": "remove"})
+                self.tasks_by_status[self.task_executions.pop(task_id).status].discard(task_id)
+                self._task_dict_cache.pop(task_id, None)
+                self._steps_index.pop(task_id, None)
+                self._status_counts.pop(task_id, None)
+                self._dirty_tasks.discard(task_id)
+                self._dirty_steps.pop(task_id, None)
+            
+            if tasks_to_remove and self.repo:
+                # Remove tracked task files in one git call and record the deletion in one commit
+                paths = [f"tasks/{task_id}" for task_id in tasks_to_remove]
+                try:
+                    with self._git_lock:
+                        self.repo.git.rm("-r", "-f", "-q", "--ignore-unmatch", "--", *paths)
+                        if self.repo.is_dirty(index=True, working_tree=False, untracked_files=False):
+                            self.repo.index.commit(f"{self.commit_prefix} Cleanup {len(paths)} old tasks")
+                except Exception as e:
+                    self.logger.error(f"Failed to commit task cleanup: {e}")
+            
+            for task_id in tasks_to_remove:
+                # Remove any task files git did not track
+                task_dir = self.workspace_path / "tasks" / task_id
+                if task_dir.exists():
+                    shutil.rmtree(task_dir)
+            
+            if tasks_to_remove:
+                _commit_info.cache_clear()
+                self.logger.info(f"Cleaned up {len(tasks_to_remove)} old tasks")
 
 # Global task tracker instance
 task_tracker = GitTaskTracker(os.getenv("TASK_WORKSPACE_PATH", "./workspace")) 
\ No newline at end of file
@@ -4,17 +4,127 @@ Provides tools for task planning, agent orchestration, progress monitoring, refl
 """
 
 import os
+import re
 import asyncio
-import json
+import logging
 import aiohttp
-from typing import Dict, List, Optional, Any, Tuple
+import orjson
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable, Set
 from google.adk.tools import FunctionTool
 # from google.adk.annotations import Schema  # <-- Removed, not available in ADK 1.3.0
 
 # Import our custom components
-from .metacognition import metacognition_engine, ReflectionType
+from .metacognition import metacognition_engine, ReflectionType, ReflectionMsg, ReflectionTemplate
 from .task_tracker import task_tracker
 
+# Keywords that pull specialised agent steps into a plan, matched anywhere in the task description
+_PLAN_KEYWORDS = re.compile(r"(search|find|file|write|create)", re.I)
+
+# Keyword -> agent step; multiple keywords may map to the same step
+_KEYWORD_STEPS = {"search": "search", "find": "search", "file": "file", "write": "file", "create": "file"}
+
+# Agent step templates in plan order; None parameter values are filled with the task description
+_STEP_TEMPLATES = {
+    "search": {
+        "description": "Gather information using search agent",
+        "agent": "search_agent",
+        "action_type": "web_search",
+        "parameters": {"query": None}
+    },
+    "file": {
+        "description": "Perform file operations using read-write agent",
+        "agent": "read_write_agent",
+        "action_type": "file_operations",
+        "parameters": {"operation": "analyze_and_execute", "task": None}
+    }
+}
+
+@lru_cache(maxsize=1024)
+def _plan_steps(task_description: str) -> Tuple[Dict[str, Any], ...]:
+    """Plan steps for a task description; shared between calls, so callers must copy before mutating"""
+    # This is a simplified planner - in practice, this would use LLM reasoning
+    matched = {_KEYWORD_STEPS[m.group(1).lower()] for m in _PLAN_KEYWORDS.finditer(task_description)}
+    kinds = [kind for kind in _STEP_TEMPLATES if kind in matched]
+    
+    # Analysis first, then the agent steps, then the final report. Agent steps depend only on
+    # the analysis step (index 0), so they can be executed as one concurrent batch
+    steps = [None] * (len(kinds) + 2)
+    steps[0] = {
+        "description": "Analyze task requirements and create detailed plan",
+        "agent": "metacognition_agent",
+        "action_type": "task_analysis",
+        "parameters": {"task_description": task_description},
+        "depends_on": []
+    }
+    
+    for i, kind in enumerate(kinds, 1):
+        template = _STEP_TEMPLATES[kind]
+        parameters = {key: task_description if value is None else value for key, value in template["parameters"].items()}
+        steps[i] = {**template, "parameters": parameters, "depends_on": [0]}
+    
+    steps[-1] = {
+        "description": "Finalize task and provide comprehensive report",
+        "agent": "metacognition_agent",
+        "action_type": "task_completion",
+        "parameters": {"task_description": task_description},
+        "depends_on": list(range(len(steps) - 1))
+    }
+    return tuple(steps)
+
+@dataclass
+class ConnectionMetrics:
+    """Request counters for calls made over the shared agent HTTP session"""
+    total_requests: int = 0
+    failed_requests: int = 0
+    total_response_time: float = 0.0
+    
+    @property
+    def average_response_time(self) -> float:
+        return self.total_response_time / self.total_requests if self.total_requests else 0.0
+    
+    def record(self, duration: float, success: bool):
+        """Record one completed request"""
+        self.total_requests += 1
+        self.total_response_time += duration
+        if not success:
+            self.failed_requests += 1
+
+@dataclass(slots=True)
+class AgentPerf:
+    """Running outcome counts and response time for one agent"""
+    total_tasks: int = 0
+    successful_tasks: int = 0
+    failed_tasks: int = 0
+    avg_response_time: float = 0.0
+    last_used: Optional[float] = None
+    
+    @property
+    def success_rate(self) -> float:
+        return self.successful_tasks / self.total_tasks if self.total_tasks else 0.0
+    
+    def record(self, success: bool, duration: float, now: float):
+        """Record one completed action, updating the mean response time incrementally (Welford)"""
+        self.total_tasks += 1
+        if success:
+            self.successful_tasks += 1
+        else:
+            self.failed_tasks += 1
+        self.avg_response_time += (duration - self.avg_response_time) / self.total_tasks
+        self.last_used = now
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_tasks": self.total_tasks,
+            "successful_tasks": self.successful_tasks,
+            "failed_tasks": self.failed_tasks,
+            "total_response_time": self.avg_response_time * self.total_tasks,
+            "last_used": self.last_used,
+            "success_rate": self.success_rate,
+            "avg_response_time": self.avg_response_time
+        }
+
 class MetacognitionTools:
     """Collection of tools for the metacognition agent"""
     
@@ -31,10 +141,127 @@ class MetacognitionTools:
                 "description": "File operations and workspace management agent"
             }
         }
-        self.agent_performance = {}
+        self.agent_performance: Dict[str, AgentPerf] = {}
+        
+        # get_agent_performance view: static agent info plus defaults, overlaid with recorded metrics
+        # and rebuilt only after _update_agent_performance has changed them
+        self._static_perf_view = {
+            agent_name: {
+                "endpoint": agent_info["endpoint"],
+                "capabilities": agent_info["capabilities"],
+                "total_tasks": 0,
+                "success_rate": 0.0,
+                "avg_response_time": 0.0,
+                "last_used": None
+            }
+            for agent_name, agent_info in self.available_agents.items()
+        }
+        self._perf_cache: Optional[Dict[str, Any]] = None
+        self._perf_dirty = True
+        
+        # One pooled HTTP session for all agent calls, created on first use
+        self.max_external_agents = int(os.getenv("MAX_EXTERNAL_AGENTS", "10"))
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        self.connection_metrics = ConnectionMetrics()
+        
+        # Optional JSON-RPC batching: calls to the same endpoint within the batch interval share one POST
+        self.batch_rpc = os.getenv("AGENT_RPC_BATCHING", "false").lower() == "true"
+        self.batch_max_size = int(os.getenv("AGENT_RPC_BATCH_SIZE", "10"))
+        self.batch_interval = int(os.getenv("AGENT_RPC_BATCH_INTERVAL_MS", "10")) / 1000
+        self._batch_queues: Dict[str, asyncio.Queue] = {}
+        self._batch_flushers: Dict[str, asyncio.Task] = {}
+        self._batch_sends: Set[asyncio.Task] = set()
+        self._batch_unsupported: Set[str] = set()
+        
+        # Bounds how many steps execute_task_steps runs at once
+        self._exec_sem = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_STEPS", "8")))
+        self.step_timeout = float(os.getenv("STEP_TIMEOUT_SECONDS", "60"))
+        
+        # Reflections run on a few background workers fed by a bounded queue; workers start on first use
+        self._reflect_q: asyncio.Queue = asyncio.Queue(maxsize=int(os.getenv("REFLECTION_QUEUE_SIZE", "256")))
+        self._reflect_workers: List[asyncio.Task] = []
+        self._reflect_worker_count = int(os.getenv("REFLECTION_WORKERS", "4"))
+        self._reflect_tail: Optional[list] = None
+        
+        self.logger = logging.getLogger("metacognition_tools")
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared agent HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            async with self._session_lock:
+                if self._session is None or self._session.closed:
+                    connector = aiohttp.TCPConnector(
+                        limit=self.max_external_agents * 4,
+                        limit_per_host=16,
+                        keepalive_timeout=60,
+                        ttl_dns_cache=300,
+                        enable_cleanup_closed=True
+                    )
+                    self._session = aiohttp.ClientSession(
+                        connector=connector,
+                        timeout=aiohttp.ClientTimeout(total=30, connect=5),
+                        headers={"Content-Type": "application/json"}
+                    )
+        return self._session
+    
+    async def aclose(self):
+        """Stop the reflection workers and batch flushers and close the shared agent HTTP session"""
+        background = [*self._reflect_workers, *self._batch_flushers.values(), *self._batch_sends]
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        self._reflect_workers = []
+        self._batch_flushers = {}
+        self._batch_queues = {}
+        
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _reflect(self, func: Callable[..., Awaitable[Any]], *args):
+        """Queue a metacognition engine call for the reflection workers
+        
+        A think() message for the same task and reflection type as the one still waiting at the
+        back of the queue is appended to it. When the queue is full the oldest job is dropped.
+        """
+        if not any(not worker.done() for worker in self._reflect_workers):
+            self._reflect_workers = [asyncio.create_task(self._reflect_worker()) for _ in range(self._reflect_worker_count)]
+        
+        tail = self._reflect_tail
+        if tail is not None and tail[0] == func == metacognition_engine.think:
+            queued, msg = tail[1][0], args[0]
+            if (isinstance(queued, ReflectionMsg) and isinstance(msg, ReflectionMsg)
+                    and queued.thought_type == msg.thought_type and queued.task_id == msg.task_id):
+                queued.follow_ups.append(msg)
+                return
+        
+        job = [func, args]
+        try:
+            self._reflect_q.put_nowait(job)
+        except asyncio.QueueFull:
+            dropped = self._reflect_q.get_nowait()
+            self._reflect_q.task_done()
+            self.logger.warning("Reflection queue full, dropped oldest %s job", dropped[0].__name__)
+            self._reflect_q.put_nowait(job)
+        self._reflect_tail = job
+    
+    async def _reflect_worker(self):
+        """Run queued reflection jobs until cancelled"""
+        while True:
+            job = await self._reflect_q.get()
+            if job is self._reflect_tail:
+                self._reflect_tail = None
+            func, args = job
+            try:
+                await func(*args)
+            except Exception as e:
+                self.logger.exception("Reflection %s failed: %s", func.__name__, e)
+            finally:
+                self._reflect_q.task_done()
     
     @FunctionTool
-    def create_orchestration_task(
+    async def create_orchestration_task(
         self,
         task_description: str,
         user_request: str,
@@ -55,7 +282,7 @@ class MetacognitionTools:
             task_id = task_tracker.create_task(task_description, user_request, estimated_steps)
             
             # Update metacognition engine
-            metacognition_engine.update_task_progress(
+            await metacognition_engine.update_task_progress(
                 task_id=task_id,
                 current_step=0,
                 total_steps=estimated_steps,
@@ -64,13 +291,12 @@ class MetacognitionTools:
             )
             
             # Generate initial reflection
-            asyncio.create_task(metacognition_engine.think(
+            self._reflect(metacognition_engine.think, ReflectionMsg(
                 ReflectionType.TASK_ANALYSIS,
-                f"Created new orchestration task: {task_description}\n"
-                f"Task ID: {task_id}\n"
-                f"Estimated steps: {estimated_steps}\n"
-                f"User request: {user_request}",
-                {"task_id": task_id, "task_description": task_description}
+                ReflectionTemplate.TASK_CREATED,
+                task_id,
+                {"task_description": task_description, "estimated_steps": estimated_steps, "user_request": user_request},
+                context_keys=("task_description",)
             ))
             
             return {
@@ -81,10 +307,11 @@ class MetacognitionTools:
                 "estimated_steps": estimated_steps
             }
         except Exception as e:
+            self.logger.exception("Failed to create task")
             return {"error": f"Failed to create task: {str(e)}"}
     
     @FunctionTool
-    def plan_task_execution(
+    async def plan_task_execution(
         self,
         task_id: str,
         task_description: str,
@@ -117,12 +344,16 @@ class MetacognitionTools:
                     step_description=step["description"],
                     agent_name=step["agent"],
                     action_type=step["action_type"],
-                    parameters=step.get("parameters", {})
+                    parameters=step.get("parameters", {}),
+                    dependencies=[plan["steps"][dep]["step_id"] for dep in step.get("depends_on", [])]
                 )
                 step["step_id"] = step_id
             
+            # Planning is a phase boundary: persist all planned steps in one commit
+            task_tracker.flush(task_id, f"Plan {len(plan['steps'])} steps")
+            
             # Update metacognition
-            metacognition_engine.update_task_progress(
+            await metacognition_engine.update_task_progress(
                 task_id=task_id,
                 current_step=0,
                 total_steps=len(plan["steps"]),
@@ -131,13 +362,17 @@ class MetacognitionTools:
             )
             
             # Reflect on the plan
-            asyncio.create_task(metacognition_engine.think(
+            self._reflect(metacognition_engine.think, ReflectionMsg(
                 ReflectionType.STRATEGY_REFLECTION,
-                f"Created execution plan for task {task_id}:\n"
-                f"Total steps: {len(plan['steps'])}\n"
-                f"Estimated duration: {plan['estimated_duration']}\n"
-                f"Required agents: {', '.join(plan['required_agents'])}",
-                {"task_id": task_id, "plan": plan}
+                ReflectionTemplate.PLAN_CREATED,
+                task_id,
+                {
+                    "total_steps": len(plan["steps"]),
+                    "estimated_duration": plan["estimated_duration"],
+                    "required_agents": ", ".join(plan["required_agents"]),
+                    "plan": plan
+                },
+                context_keys=("plan",)
             ))
             
             return {
@@ -147,6 +382,7 @@ class MetacognitionTools:
                 "total_steps": len(plan["steps"])
             }
         except Exception as e:
+            self.logger.exception("Failed to plan task")
             return {"error": f"Failed to plan task: {str(e)}"}
     
     @FunctionTool
@@ -169,7 +405,7 @@ class MetacognitionTools:
             if not task:
                 return {"error": f"Task {task_id} not found"}
             
-            step = next((s for s in task.steps if s.step_id == step_id), None)
+            step = task_tracker.get_step(task_id, step_id)
             if not step:
                 return {"error": f"Step {step_id} not found"}
             
@@ -192,7 +428,7 @@ class MetacognitionTools:
             )
             
             # Update metacognition
-            metacognition_engine.update_task_progress(
+            await metacognition_engine.update_task_progress(
                 task_id=task_id,
                 current_step=step.step_number,
                 total_steps=len(task.steps),
@@ -203,15 +439,7 @@ class MetacognitionTools:
             )
             
             # Reflect on step execution
-            asyncio.create_task(metacognition_engine.think(
-                ReflectionType.AGENT_PERFORMANCE,
-                f"Executed step {step.step_number} for task {task_id}:\n"
-                f"Agent: {step.agent_name}\n"
-                f"Action: {step.action_type}\n"
-                f"Status: {status}\n"
-                f"Result: {result.get('message', 'No message')}",
-                {"task_id": task_id, "step_id": step_id, "result": result}
-            ))
+            self._reflect(metacognition_engine.think, self._step_reflection(task_id, step, status, result))
             
             return {
                 "success": True,
@@ -221,10 +449,117 @@ class MetacognitionTools:
                 "result": result
             }
         except Exception as e:
+            self.logger.exception("Failed to execute step")
             return {"error": f"Failed to execute step: {str(e)}"}
     
     @FunctionTool
-    def monitor_task_progress(
+    async def execute_task_steps(
+        self,
+        task_id: str,
+        step_ids: List[str]
+    ) -> Dict[str, Any]:
+        """Execute several independent steps of a task concurrently
+        
+        Args:
+            task_id: ID of the task
+            step_ids: IDs of steps with no dependencies on each other
+            
+        Returns:
+            Dict containing per-step execution results, in completion order
+        """
+        try:
+            task = task_tracker.get_task(task_id)
+            if not task:
+                return {"error": f"Task {task_id} not found"}
+            
+            steps = [task_tracker.get_step(task_id, step_id) for step_id in step_ids]
+            missing = [step_id for step_id, step in zip(step_ids, steps) if step is None]
+            if missing:
+                return {"error": f"Steps not found: {', '.join(missing)}"}
+            
+            for step in steps:
+                task_tracker.update_step_status(task_id, step.step_id, "in_progress")
+            
+            # Run all steps at once, bounded by the step semaphore, and record each as soon as it finishes
+            outcomes = []
+            succeeded = []
+            failed = []
+            for next_done in asyncio.as_completed([self._run_one(step) for step in steps]):
+                step, status, result = await next_done
+                task_tracker.update_step_status(
+                    task_id, step.step_id, status,
+                    result=result,
+                    metadata={"execution_time": result.get("duration", 0)}
+                )
+                outcomes.append({"step_id": step.step_id, "status": status, "result": result})
+                (succeeded if status == "completed" else failed).append(step.step_description)
+                
+                # Reflect on step execution; back-to-back reflections for this task are merged in the queue
+                self._reflect(metacognition_engine.think, self._step_reflection(task_id, step, status, result))
+            
+            last_step = max(step.step_number for step in steps) if steps else 0
+            
+            # Update metacognition
+            await metacognition_engine.update_task_progress(
+                task_id=task_id,
+                current_step=last_step,
+                total_steps=len(task.steps),
+                status="executing",
+                completion_percentage=(last_step / len(task.steps)) * 100 if task.steps else 0,
+                successes=succeeded,
+                failures=failed
+            )
+            
+            return {
+                "success": True,
+                "task_id": task_id,
+                "results": outcomes
+            }
+        except Exception as e:
+            self.logger.exception("Failed to execute steps")
+            return {"error": f"Failed to execute steps: {str(e)}"}
+    
+    def _step_reflection(self, task_id: str, step, status: str, result: Dict[str, Any]) -> ReflectionMsg:
+        """Reflection message for a finished step"""
+        return ReflectionMsg(
+            ReflectionType.AGENT_PERFORMANCE,
+            ReflectionTemplate.STEP_EXECUTED,
+            task_id,
+            {
+                "step_number": step.step_number,
+                "agent": step.agent_name,
+                "action": step.action_type,
+                "status": status,
+                "message": result.get("message", result.get("error", "No message")),
+                "step_id": step.step_id,
+                "result": result
+            },
+            context_keys=("step_id", "result")
+        )
+    
+    async def _run_one(self, step) -> Tuple[Any, str, Dict[str, Any]]:
+        """Execute a single step's agent action under the concurrency limit and step timeout
+        
+        Returns the step with its resulting status and result, so completions can be handled in any order.
+        """
+        async with self._exec_sem:
+            try:
+                result = await asyncio.wait_for(
+                    self._execute_agent_action(
+                        agent_name=step.agent_name,
+                        action_type=step.action_type,
+                        parameters=step.parameters
+                    ),
+                    timeout=self.step_timeout
+                )
+            except asyncio.TimeoutError:
+                return step, "timeout", {"success": False, "error": f"Step timed out after {self.step_timeout}s", "duration": self.step_timeout}
+            except Exception as e:
+                return step, "failed", {"success": False, "error": str(e), "duration": 0}
+        return step, "completed" if result.get("success") else "failed", result
+    
+    @FunctionTool
+    async def monitor_task_progress(
         self,
         task_id: str
     ) -> Dict[str, Any]:
@@ -241,20 +576,22 @@ class MetacognitionTools:
             if not task:
                 return {"error": f"Task {task_id} not found"}
             
-            # Calculate progress metrics
-            completed_steps = len([s for s in task.steps if s.status == "completed"])
-            failed_steps = len([s for s in task.steps if s.status == "failed"])
-            pending_steps = len([s for s in task.steps if s.status == "pending"])
+            # Calculate progress metrics from the tracker's running status counts
+            counts = task_tracker.status_counts(task_id)
+            completed_steps = counts.get("completed", 0)
+            failed_steps = counts.get("failed", 0) + counts.get("timeout", 0)
+            pending_steps = counts.get("pending", 0)
             
             progress_percentage = (completed_steps / len(task.steps)) * 100 if task.steps else 0
             
-            # Identify bottlenecks
+            # Identify bottlenecks: failed steps, or steps taking more than 30 seconds
             bottlenecks = []
-            for step in task.steps:
-                if step.status == "failed":
-                    bottlenecks.append(f"Step {step.step_number}: {step.step_description}")
-                elif step.duration and step.duration > 30:  # Steps taking more than 30 seconds
-                    bottlenecks.append(f"Step {step.step_number}: Slow execution ({step.duration:.1f}s)")
+            if failed_steps or completed_steps:
+                for step in task.steps:
+                    if step.status in ("failed", "timeout"):
+                        bottlenecks.append(f"Step {step.step_number}: {step.step_description}")
+                    elif step.duration and step.duration > 30:
+                        bottlenecks.append(f"Step {step.step_number}: Slow execution ({step.duration:.1f}s)")
             
             # Generate progress report
             progress_report = {
@@ -272,7 +609,7 @@ class MetacognitionTools:
             }
             
             # Update metacognition
-            metacognition_engine.update_task_progress(
+            await metacognition_engine.update_task_progress(
                 task_id=task_id,
                 current_step=completed_steps,
                 total_steps=len(task.steps),
@@ -282,13 +619,14 @@ class MetacognitionTools:
             )
             
             # Reflect on progress
-            asyncio.create_task(metacognition_engine.reflect_on_task(task_id, task.task_description))
+            self._reflect(metacognition_engine.reflect_on_task, task_id, task.task_description)
             
             return {
                 "success": True,
                 "progress_report": progress_report
             }
         except Exception as e:
+            self.logger.exception("Failed to monitor progress")
             return {"error": f"Failed to monitor progress: {str(e)}"}
     
     @FunctionTool
@@ -309,8 +647,8 @@ class MetacognitionTools:
             if not task:
                 return {"error": f"Task {task_id} not found"}
             
-            # Check if all steps are completed
-            all_completed = all(s.status == "completed" for s in task.steps)
+            # Check if all steps are completed using the tracker's running completion count
+            all_completed = task.completed_steps == len(task.steps)
             
             if all_completed:
                 # Mark task as completed
@@ -320,7 +658,7 @@ class MetacognitionTools:
                 })
                 
                 # Final reflection
-                asyncio.create_task(metacognition_engine.assess_completion(task_id))
+                self._reflect(metacognition_engine.assess_completion, task_id)
                 
                 return {
                     "success": True,
@@ -331,15 +669,15 @@ class MetacognitionTools:
                 }
             else:
                 # Check for failed steps
-                failed_steps = [s for s in task.steps if s.status == "failed"]
+                failed_steps = task_tracker.step_count(task_id, "failed", "timeout")
                 if failed_steps:
-                    task_tracker.fail_task(task_id, f"Task failed due to {len(failed_steps)} failed steps")
+                    task_tracker.fail_task(task_id, f"Task failed due to {failed_steps} failed steps")
                     return {
                         "success": False,
                         "task_id": task_id,
                         "status": "failed",
-                        "failed_steps": len(failed_steps),
-                        "message": f"Task failed due to {len(failed_steps)} failed steps"
+                        "failed_steps": failed_steps,
+                        "message": f"Task failed due to {failed_steps} failed steps"
                     }
                 else:
                     return {
@@ -349,6 +687,7 @@ class MetacognitionTools:
                         "message": "Task is still in progress"
                     }
         except Exception as e:
+            self.logger.exception("Failed to assess completion")
             return {"error": f"Failed to assess completion: {str(e)}"}
     
     @FunctionTool
@@ -359,64 +698,38 @@ class MetacognitionTools:
             Dict containing agent performance data
         """
         try:
-            performance_data = {}
-            
-            for agent_name, agent_info in self.available_agents.items():
-                if agent_name in self.agent_performance:
-                    performance_data[agent_name] = self.agent_performance[agent_name]
-                else:
-                    performance_data[agent_name] = {
-                        "endpoint": agent_info["endpoint"],
-                        "capabilities": agent_info["capabilities"],
-                        "total_tasks": 0,
-                        "success_rate": 0.0,
-                        "avg_response_time": 0.0,
-                        "last_used": None
-                    }
+            if self._perf_dirty or self._perf_cache is None:
+                self._perf_cache = {
+                    agent_name: {**static, **self.agent_performance[agent_name].as_dict()} if agent_name in self.agent_performance else dict(static)
+                    for agent_name, static in self._static_perf_view.items()
+                }
+                self._perf_dirty = False
             
+            metrics = self.connection_metrics
+            plan_cache = _plan_steps.cache_info()
             return {
                 "success": True,
-                "agent_performance": performance_data
+                "agent_performance": self._perf_cache,
+                "connection_metrics": {
+                    **asdict(metrics),
+                    "average_response_time": metrics.average_response_time
+                },
+                "plan_cache": {
+                    "hits": plan_cache.hits,
+                    "misses": plan_cache.misses,
+                    "size": plan_cache.currsize
+                }
             }
         except Exception as e:
+            self.logger.exception("Failed to get agent performance")
             return {"error": f"Failed to get agent performance: {str(e)}"}
     
     def _create_execution_plan(self, task_description: str, available_agents: List[str]) -> Dict[str, Any]:
         """Create an execution plan for a task"""
-        # This is a simplified planner - in practice, this would use LLM reasoning
-        steps = []
-        
-        # Analyze task and determine required steps
-        if "search" in task_description.lower() or "find" in task_description.lower():
-            steps.append({
-                "description": "Gather information using search agent",
-                "agent": "search_agent",
-                "action_type": "web_search",
-                "parameters": {"query": task_description}
-            })
-        
-        if "file" in task_description.lower() or "write" in task_description.lower() or "create" in task_description.lower():
-            steps.append({
-                "description": "Perform file operations using read-write agent",
-                "agent": "read_write_agent",
-                "action_type": "file_operations",
-                "parameters": {"operation": "analyze_and_execute", "task": task_description}
-            })
-        
-        # Add planning and analysis steps
-        steps.insert(0, {
-            "description": "Analyze task requirements and create detailed plan",
-            "agent": "metacognition_agent",
-            "action_type": "task_analysis",
-            "parameters": {"task_description": task_description}
-        })
-        
-        steps.append({
-            "description": "Finalize task and provide comprehensive report",
-            "agent": "metacognition_agent",
-            "action_type": "task_completion",
-            "parameters": {"task_description": task_description}
-        })
+        steps = [
+            {**step, "parameters": dict(step["parameters"]), "depends_on": list(step["depends_on"])}
+            for step in _plan_steps(task_description)
+        ]
         
         return {
             "steps": steps,
@@ -438,32 +751,22 @@ class MetacognitionTools:
                 }
             
             agent_info = self.available_agents[agent_name]
+            endpoint = agent_info["endpoint"]
             
-            # In a real implementation, this would make HTTP calls to agent endpoints
-            # For now, we'll simulate the execution
-            await asyncio.sleep(1)  # Simulate execution time
-            
-            # Simulate different agent responses
-            if agent_name == "search_agent":
-                result = {
-                    "success": True,
-                    "message": f"Search completed for: {parameters.get('query', 'unknown')}",
-                    "results": ["Result 1", "Result 2", "Result 3"],
-                    "duration": asyncio.get_event_loop().time() - start_time
-                }
-            elif agent_name == "read_write_agent":
-                result = {
-                    "success": True,
-                    "message": f"File operations completed for: {action_type}",
-                    "files_processed": 3,
-                    "duration": asyncio.get_event_loop().time() - start_time
-                }
+            if self.batch_rpc and agent_info.get("supports_batch", True) and endpoint not in self._batch_unsupported:
+                status, payload = await self._enqueue_batched(endpoint, action_type, parameters)
             else:
-                result = {
-                    "success": True,
-                    "message": f"Action {action_type} completed successfully",
-                    "duration": asyncio.get_event_loop().time() - start_time
-                }
+                status, payload = await self._post_action(endpoint, action_type, parameters)
+            
+            if not isinstance(payload, dict):
+                payload = {"data": payload}
+            result = {
+                "message": f"Action {action_type} completed by {agent_name}",
+                **payload,
+                "success": status < 400 and payload.get("success", True),
+                "duration": asyncio.get_event_loop().time() - start_time
+            }
+            self.connection_metrics.record(result["duration"], result["success"])
             
             # Update agent performance
             self._update_agent_performance(agent_name, result)
@@ -472,35 +775,108 @@ class MetacognitionTools:
             
         except Exception as e:
             duration = asyncio.get_event_loop().time() - start_time
+            self.connection_metrics.record(duration, False)
             return {
                 "success": False,
                 "error": str(e),
                 "duration": duration
             }
     
-    def _update_agent_performance(self, agent_name: str, result: Dict[str, Any]):
-        """Update agent performance metrics"""
-        if agent_name not in self.agent_performance:
-            self.agent_performance[agent_name] = {
-                "total_tasks": 0,
-                "successful_tasks": 0,
-                "failed_tasks": 0,
-                "total_response_time": 0.0,
-                "last_used": None
-            }
+    async def _post_action(self, endpoint: str, action_type: str, parameters: Dict[str, Any]) -> Tuple[int, Any]:
+        """POST a single action to an agent endpoint, returning the HTTP status and decoded body"""
+        session = await self._get_session()
+        body = orjson.dumps({"action_type": action_type, "parameters": parameters}, option=orjson.OPT_NON_STR_KEYS, default=str)
+        async with session.post(endpoint, data=body) as response:
+            return response.status, await response.json(loads=orjson.loads, content_type=None)
+    
+    def _enqueue_batched(self, endpoint: str, action_type: str, parameters: Dict[str, Any]) -> asyncio.Future:
+        """Queue an action for the endpoint's next JSON-RPC batch; the future resolves to (status, body)"""
+        if endpoint not in self._batch_flushers or self._batch_flushers[endpoint].done():
+            self._batch_queues[endpoint] = asyncio.Queue()
+            self._batch_flushers[endpoint] = asyncio.create_task(self._batch_flusher(endpoint, self._batch_queues[endpoint]))
         
-        perf = self.agent_performance[agent_name]
-        perf["total_tasks"] += 1
-        perf["last_used"] = asyncio.get_event_loop().time()
+        future = asyncio.get_running_loop().create_future()
+        self._batch_queues[endpoint].put_nowait((action_type, parameters, future))
+        return future
+    
+    async def _batch_flusher(self, endpoint: str, calls: asyncio.Queue):
+        """Collect queued calls for one endpoint into batches of up to batch_max_size and send them"""
+        while True:
+            batch = [await calls.get()]
+            if calls.qsize() < self.batch_max_size - 1:
+                await asyncio.sleep(self.batch_interval)
+            while len(batch) < self.batch_max_size and not calls.empty():
+                batch.append(calls.get_nowait())
+            
+            send = asyncio.create_task(self._send_batch(endpoint, batch))
+            self._batch_sends.add(send)
+            send.add_done_callback(self._batch_sends.discard)
+    
+    async def _send_batch(self, endpoint: str, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]):
+        """POST one JSON-RPC batch and resolve each call's future from its response entry
         
-        if result.get("success"):
-            perf["successful_tasks"] += 1
-        else:
-            perf["failed_tasks"] += 1
+        Endpoints that don't answer a batch with a JSON array are remembered as not supporting
+        batching, and the calls are re-sent one at a time.
+        """
+        # Calls whose callers gave up (e.g. step timeout) while queued are not sent
+        batch = [call for call in batch if not call[2].done()]
+        if not batch:
+            return
         
-        perf["total_response_time"] += result.get("duration", 0)
-        perf["success_rate"] = perf["successful_tasks"] / perf["total_tasks"]
-        perf["avg_response_time"] = perf["total_response_time"] / perf["total_tasks"]
+        try:
+            requests = [
+                {"jsonrpc": "2.0", "id": i, "method": action_type, "params": parameters}
+                for i, (action_type, parameters, _) in enumerate(batch)
+            ]
+            session = await self._get_session()
+            body = orjson.dumps(requests, option=orjson.OPT_NON_STR_KEYS, default=str)
+            async with session.post(endpoint, data=body) as response:
+                status = response.status
+                replies = await response.json(loads=orjson.loads, content_type=None)
+            
+            if not isinstance(replies, list):
+                self.logger.info("Endpoint %s does not accept batched calls, sending them individually", endpoint)
+                self._batch_unsupported.add(endpoint)
+                await asyncio.gather(*(
+                    self._resolve_single(endpoint, action_type, parameters, future)
+                    for action_type, parameters, future in batch
+                ))
+                return
+            
+            replies_by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+            for i, (_, _, future) in enumerate(batch):
+                if future.done():
+                    continue
+                reply = replies_by_id.get(i)
+                if reply is None:
+                    future.set_exception(RuntimeError(f"No response for batched call {i} from {endpoint}"))
+                elif "error" in reply:
+                    future.set_result((status, {"success": False, "error": reply["error"]}))
+                else:
+                    future.set_result((status, reply.get("result")))
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    async def _resolve_single(self, endpoint: str, action_type: str, parameters: Dict[str, Any], future: asyncio.Future):
+        """Send one call outside a batch and resolve its future with the outcome"""
+        try:
+            outcome = await self._post_action(endpoint, action_type, parameters)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(outcome)
+    
+    def _update_agent_performance(self, agent_name: str, result: Dict[str, Any]):
+        """Update agent performance metrics"""
+        perf = self.agent_performance.get(agent_name)
+        if perf is None:
+            perf = self.agent_performance[agent_name] = AgentPerf()
+        perf.record(bool(result.get("success")), result.get("duration", 0), asyncio.get_event_loop().time())
+        self._perf_dirty = True
 
 # Create global tools instance
 metacognition_tools = MetacognitionTools() 
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+Shared fixtures for metacognition agent tests
+
+Modules are loaded straight from their files so the package __init__ (which pulls in
+the ADK agent) is not imported; their module-level instances get a scratch workspace.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "app" / "metacognition_agent"
+
+os.environ.setdefault("TASK_WORKSPACE_PATH", tempfile.mkdtemp(prefix="task_workspace_"))
+
+def load_module(name: str):
+    """Import one module of the metacognition_agent package by file path"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, PACKAGE_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope="session")
+def task_tracker_module():
+    return load_module("task_tracker")
@@ -0,0 +1,75 @@
+"""
+Tests for the task tracker's write-ahead log and startup recovery
+"""
+
+import git
+import pytest
+
+@pytest.fixture
+def make_tracker(task_tracker_module, tmp_path, monkeypatch):
+    monkeypatch.setenv("AUTO_COMMIT_MODE", "batched")
+    monkeypatch.setenv("WORKTREE_ISOLATION", "false")
+    
+    def make():
+        tracker = task_tracker_module.GitTaskTracker(str(tmp_path / "workspace"))
+        tracker.flush_commits()
+        return tracker
+    return make
+
+def commit_count(tracker) -> int:
+    return int(git.Repo(tracker.workspace_path).git.rev_list("--count", "HEAD"))
+
+def run_task(tracker) -> str:
+    task_id = tracker.create_task("Write a report", "write a report", estimated_steps=2)
+    tracker.start_task(task_id)
+    step_ids = [tracker.add_task_step(task_id, f"Step {i}", "writer", "write") for i in range(2)]
+    for step_id in step_ids:
+        tracker.update_step_status(task_id, step_id, "completed", {"ok": True})
+    tracker.flush_commits()
+    return task_id
+
+def test_restart_after_clean_flush_makes_no_commit(make_tracker):
+    tracker = make_tracker()
+    run_task(tracker)
+    commits = commit_count(tracker)
+    assert tracker._wal_path.stat().st_size == 0
+    
+    for _ in range(2):
+        restarted = make_tracker()
+        assert commit_count(restarted) == commits
+        assert restarted._wal_path.stat().st_size == 0
+
+def test_unflushed_changes_are_recovered_once(make_tracker):
+    tracker = make_tracker()
+    task_id = tracker.create_task("Plan a trip", "plan a trip", estimated_steps=1)
+    tracker.start_task(task_id)
+    # Batched mode: a new pending step is only logged, not written to the task files
+    step_id = tracker.add_task_step(task_id, "Book flights", "planner", "book")
+    tracker.flush_commits()
+    assert tracker._wal_path.stat().st_size > 0
+    commits = commit_count(tracker)
+    
+    recovered = make_tracker()
+    assert recovered.get_step(task_id, step_id).step_description == "Book flights"
+    assert recovered.status_counts(task_id) == {"pending": 1}
+    assert commit_count(recovered) == commits + 1
+    assert recovered._wal_path.stat().st_size == 0
+    
+    restarted = make_tracker()
+    assert commit_count(restarted) == commits + 1
+    assert restarted.get_step(task_id, step_id) is not None
+
+def test_step_counts_match_steps_after_updates(make_tracker):
+    tracker = make_tracker()
+    task_id = tracker.create_task("Count steps", "count steps", estimated_steps=3)
+    step_ids = [tracker.add_task_step(task_id, f"Step {i}", "worker", "run") for i in range(3)]
+    tracker.update_step_status(task_id, step_ids[0], "in_progress")
+    tracker.update_step_status(task_id, step_ids[0], "completed")
+    tracker.update_step_status(task_id, step_ids[1], "failed")
+    tracker.update_step_status(task_id, step_ids[1], "in_progress")
+    
+    task = tracker.get_task(task_id)
+    counts = tracker.status_counts(task_id)
+    assert sum(counts.values()) == len(task.steps)
+    assert counts == {"completed": 1, "in_progress": 1, "pending": 1}
+    assert task.completed_steps == 1
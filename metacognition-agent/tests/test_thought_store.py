@@ -0,0 +1,53 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from conftest import load_module
+
+@pytest.fixture
+def make_engine(monkeypatch, tmp_path):
+    metacognition = load_module("metacognition")
+    db_path = tmp_path / "thoughts.db"
+    monkeypatch.setenv("METACOGNITION_THOUGHT_DB", str(db_path))
+    monkeypatch.setenv("METACOGNITION_THOUGHT_HISTORY", "50")
+    monkeypatch.setenv("ENABLE_INTERNAL_MONOLOGUE", "true")
+    return metacognition, db_path
+
+def stored_count(db_path) -> int:
+    with sqlite3.connect(db_path) as db:
+        return db.execute("SELECT COUNT(*) FROM thoughts").fetchone()[0]
+
+def test_queued_thoughts_are_visible_and_flushed(make_engine):
+    metacognition, db_path = make_engine
+    
+    async def scenario():
+        engine = metacognition.MetacognitionEngine()
+        for i in range(60):
+            await engine.think(metacognition.ReflectionType.TASK_ANALYSIS, f"thought {i}")
+        # Ten thoughts have left the hot window but the writer has not run yet
+        thoughts = engine.get_thoughts_by_type(metacognition.ReflectionType.TASK_ANALYSIS)
+        assert [t.content for t in thoughts] == [f"thought {i}" for i in range(60)]
+        
+        await engine.stop_reflection_loop()
+        await engine.flush_thoughts()
+        assert stored_count(db_path) == 60
+        thoughts = engine.get_thoughts_by_type(metacognition.ReflectionType.TASK_ANALYSIS)
+        assert len(thoughts) == 60
+    
+    asyncio.run(scenario())
+
+def test_partial_batch_is_written_after_interval(make_engine, monkeypatch):
+    metacognition, db_path = make_engine
+    monkeypatch.setattr(metacognition, "_THOUGHT_FLUSH_INTERVAL", 0.05)
+    
+    async def scenario():
+        engine = metacognition.MetacognitionEngine()
+        for i in range(3):
+            await engine.think(metacognition.ReflectionType.PROGRESS_EVALUATION, f"thought {i}")
+        await asyncio.sleep(0.2)
+        assert stored_count(db_path) == 3
+        await engine.stop_reflection_loop()
+        await engine.flush_thoughts()
+    
+    asyncio.run(scenario())
@@ -4,18 +4,82 @@ Handles A2A protocol settings, agent discovery, and integration configuration
 """
 
 import os
+import sys
+import queue
 import asyncio
-from typing import Dict, List, Optional, Any
+import time
+import hashlib
+import logging
+import logging.handlers
+import orjson
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, FrozenSet
 from dataclasses import dataclass
 
-@dataclass
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking or erroring when the queue is full"""
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+def _queued_logger(name: str, capacity: int = 1024) -> logging.Logger:
+    """Logger whose records are formatted and written by a background listener thread"""
+    log = logging.getLogger(name)
+    if not log.handlers:
+        records = queue.Queue(maxsize=capacity)
+        log.addHandler(_DroppingQueueHandler(records))
+        log.setLevel(os.getenv("A2A_LOG_LEVEL", "INFO").upper())
+        log.propagate = False
+        logging.handlers.QueueListener(records, logging.StreamHandler()).start()
+    return log
+
+logger = _queued_logger("a2a_config")
+
+# Capabilities an agent needs (any one of) to help with each file operation
+OPERATION_CAPABILITIES = {
+    "read": frozenset(["document_processing", "text_extraction"]),
+    "write": frozenset(["document_processing", "format_conversion"]),
+    "analyze": frozenset(["code_analysis", "data_analysis", "image_analysis"]),
+    "backup": frozenset(["backup_management", "file_synchronization"]),
+    "convert": frozenset(["format_conversion", "image_conversion"])
+}
+
+# Agents returned by simulated discovery: (name, endpoint path, capabilities, description)
+SIMULATED_AGENTS = (
+    ("code_analyzer_agent", "code_analyzer",
+     ("code_analysis", "syntax_checking", "code_review"),
+     "Analyzes code files for quality, syntax, and best practices"),
+    ("document_processor_agent", "document_processor",
+     ("document_processing", "text_extraction", "format_conversion"),
+     "Processes documents and extracts information from various formats"),
+    ("image_processor_agent", "image_processor",
+     ("image_processing", "image_analysis", "image_conversion"),
+     "Processes and analyzes image files"),
+    ("data_analyzer_agent", "data_analyzer",
+     ("data_analysis", "statistics", "data_visualization"),
+     "Analyzes data files and provides statistical insights"),
+    ("backup_manager_agent", "backup_manager",
+     ("backup_management", "file_synchronization", "version_control"),
+     "Manages file backups and synchronization")
+)
+
+@dataclass(frozen=True, slots=True)
 class A2AAgentInfo:
     """Information about an A2A agent"""
     name: str
     endpoint: str
-    capabilities: List[str]
+    capabilities: FrozenSet[str]
     description: str
     auth_token: Optional[str] = None
+    
+    def __post_init__(self):
+        # Accept any iterable of capabilities, normalized to lowercase once so lookups are a plain set/dict hit;
+        # share endpoint strings between rediscoveries
+        object.__setattr__(self, "capabilities", frozenset(cap.lower() for cap in self.capabilities))
+        object.__setattr__(self, "endpoint", sys.intern(self.endpoint))
 
 class A2AConfig:
     """A2A configuration manager for file operations"""
@@ -25,38 +89,63 @@ class A2AConfig:
         self.port = int(os.getenv("A2A_PORT", "8080"))
         self.auth_token = os.getenv("A2A_AUTH_TOKEN")
         self.discovery_interval = int(os.getenv("A2A_DISCOVERY_INTERVAL", "300"))
+        self.discovery_ttl = float(os.getenv("A2A_DISCOVERY_TTL", "60"))
+        self.active_discovery_interval = float(os.getenv("A2A_ACTIVE_DISCOVERY_INTERVAL", "30"))
+        self.max_discovery_failures = int(os.getenv("A2A_DISCOVERY_MAX_FAILURES", "3"))
         self.max_external_agents = int(os.getenv("MAX_EXTERNAL_AGENTS", "10"))
         self.enabled = os.getenv("ENABLE_A2A_INTEGRATION", "true").lower() == "true"
         
-        # Registry of discovered agents
-        self.agent_registry: Dict[str, A2AAgentInfo] = {}
+        # Endpoint URL and request headers are fixed by the settings above, so build them once
+        self._base_url = f"http://{self.host}:{self.port}"
+        self._auth_headers = {"Content-Type": "application/json"}
+        if self.auth_token:
+            self._auth_headers["Authorization"] = f"Bearer {self.auth_token}"
         
-        # Discovery task
+        # Registry of discovered agents (read-only; discovery swaps in a new one)
+        self.agent_registry: Mapping[str, A2AAgentInfo] = MappingProxyType({})
+        
+        # Simulated discovery results never change, so build the agent records once
+        self._simulated_agents = tuple(
+            A2AAgentInfo(name=name, endpoint=f"{self._base_url}/{path}", capabilities=capabilities, description=description)
+            for name, path, capabilities, description in SIMULATED_AGENTS
+        )
+        
+        # Lookup indexes over the registry, rebuilt whenever discovery updates it
+        self._cap_index: Dict[str, List[A2AAgentInfo]] = {}
+        self._operation_index: Dict[str, List[A2AAgentInfo]] = {}
+        
+        # Digest of the last discovered agent set; unchanged rediscoveries leave the registry alone
+        self._last_discovery_digest: Optional[bytes] = None
+        
+        # Monotonic time of the last successful discovery; on-demand lookups within the TTL reuse it
+        self._discovered_at: Optional[float] = None
+        
+        # Discovery task and its scheduling state
         self._discovery_task: Optional[asyncio.Task] = None
+        self._last_discovery_attempt: Optional[float] = None
+        self._last_activity: Optional[float] = None
+        self._discovery_failures = 0
     
     def get_endpoint_url(self) -> str:
         """Get the A2A endpoint URL"""
-        return f"http://{self.host}:{self.port}"
+        return self._base_url
     
     def get_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers for A2A requests"""
-        headers = {"Content-Type": "application/json"}
-        if self.auth_token:
-            headers["Authorization"] = f"Bearer {self.auth_token}"
-        return headers
+        return self._auth_headers.copy()
     
     async def start_discovery(self):
         """Start periodic agent discovery"""
         if not self.enabled:
-            print("A2A integration is disabled")
+            logger.info("A2A integration is disabled")
             return
         
         if self._discovery_task and not self._discovery_task.done():
-            print("Discovery task already running")
+            logger.info("Discovery task already running")
             return
         
         self._discovery_task = asyncio.create_task(self._discovery_loop())
-        print(f"A2A discovery started with {self.discovery_interval}s interval")
+        logger.info("A2A discovery started with %ss interval", self.discovery_interval)
     
     async def stop_discovery(self):
         """Stop periodic agent discovery"""
@@ -66,73 +155,117 @@ class A2AConfig:
                 await self._discovery_task
             except asyncio.CancelledError:
                 pass
-            print("A2A discovery stopped")
+            logger.info("A2A discovery stopped")
     
     async def _discovery_loop(self):
         """Main discovery loop"""
         while True:
             try:
-                await self._discover_agents()
-                await asyncio.sleep(self.discovery_interval)
+                delay = self._next_discovery_delay()
+                if delay > 0:
+                    # Wake at least every active interval so new activity speeds polling up promptly
+                    await asyncio.sleep(min(delay, self.active_discovery_interval))
+                    continue
+                
+                self._last_discovery_attempt = time.monotonic()
+                if await self._discover_agents():
+                    self._discovery_failures = 0
+                else:
+                    self._discovery_failures += 1
+                    if self._discovery_failures == self.max_discovery_failures:
+                        logger.warning("A2A discovery failed %d times in a row, backing off", self._discovery_failures)
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                print(f"Error in A2A discovery loop: {e}")
+                logger.exception("Error in A2A discovery loop: %s", e)
                 await asyncio.sleep(60)  # Wait 1 minute before retrying
     
-    async def _discover_agents(self):
-        """Discover available A2A agents for file operations"""
+    def mark_activity(self):
+        """Record that agents are being looked up, so the discovery loop polls at the active interval"""
+        self._last_activity = time.monotonic()
+    
+    def _next_discovery_delay(self) -> float:
+        """Seconds until the discovery loop should next poll
+        
+        Polls every active_discovery_interval while there has been lookup activity within the
+        last discovery_interval, and every discovery_interval otherwise. Failed polls are retried
+        after a minute until max_discovery_failures in a row, after which the retry interval
+        doubles (capped at an hour) until a poll succeeds.
+        """
+        if self._last_discovery_attempt is None:
+            return 0.0
+        
+        now = time.monotonic()
+        if self._discovery_failures >= self.max_discovery_failures:
+            excess = self._discovery_failures - self.max_discovery_failures
+            return self._last_discovery_attempt + min(self.discovery_interval * 2 ** excess, 3600) - now
+        if self._discovery_failures:
+            return self._last_discovery_attempt + 60 - now
+        
+        active = self._last_activity is not None and now - self._last_activity < self.discovery_interval
+        interval = self.active_discovery_interval if active else self.discovery_interval
+        # An on-demand discover_agents() call also counts as a fresh poll
+        return max(self._last_discovery_attempt, self._discovered_at or 0.0) + interval - now
+    
+    async def _discover_agents(self) -> bool:
+        """Discover available A2A agents for file operations, returning whether discovery succeeded"""
         try:
             # This would use the A2A SDK to discover agents
             # For now, we'll simulate discovery with file operation specific agents
-            example_agents = [
-                A2AAgentInfo(
-                    name="code_analyzer_agent",
-                    endpoint=f"{self.get_endpoint_url()}/code_analyzer",
-                    capabilities=["code_analysis", "syntax_checking", "code_review"],
-                    description="Analyzes code files for quality, syntax, and best practices"
-                ),
-                A2AAgentInfo(
-                    name="document_processor_agent",
-                    endpoint=f"{self.get_endpoint_url()}/document_processor",
-                    capabilities=["document_processing", "text_extraction", "format_conversion"],
-                    description="Processes documents and extracts information from various formats"
-                ),
-                A2AAgentInfo(
-                    name="image_processor_agent",
-                    endpoint=f"{self.get_endpoint_url()}/image_processor",
-                    capabilities=["image_processing", "image_analysis", "image_conversion"],
-                    description="Processes and analyzes image files"
-                ),
-                A2AAgentInfo(
-                    name="data_analyzer_agent",
-                    endpoint=f"{self.get_endpoint_url()}/data_analyzer",
-                    capabilities=["data_analysis", "statistics", "data_visualization"],
-                    description="Analyzes data files and provides statistical insights"
-                ),
-                A2AAgentInfo(
-                    name="backup_manager_agent",
-                    endpoint=f"{self.get_endpoint_url()}/backup_manager",
-                    capabilities=["backup_management", "file_synchronization", "version_control"],
-                    description="Manages file backups and synchronization"
-                )
-            ]
+            example_agents = self._simulated_agents
             
-            # Update registry
-            for agent in example_agents:
-                self.agent_registry[agent.name] = agent
+            digest = hashlib.blake2b(
+                orjson.dumps(sorted((a.name, a.endpoint, sorted(a.capabilities)) for a in example_agents)),
+                digest_size=16
+            ).digest()
+            if digest == self._last_discovery_digest:
+                self._discovered_at = time.monotonic()
+                return True
             
-            print(f"Discovered {len(example_agents)} A2A agents for file operations")
+            # Swap in a fully built registry so readers never see a partial one
+            self.agent_registry = MappingProxyType({agent.name: agent for agent in example_agents})
+            self._rebuild_indexes()
+            self._last_discovery_digest = digest
+            self._discovered_at = time.monotonic()
+            
+            logger.info("Discovered %d A2A agents for file operations", len(example_agents))
+            return True
             
         except Exception as e:
-            print(f"Error discovering A2A agents: {e}")
+            logger.exception("Error discovering A2A agents: %s", e)
+            return False
+    
+    async def discover_agents(self, capability: Optional[str] = None, refresh: bool = False) -> List[A2AAgentInfo]:
+        """Get discovered agents, optionally only those with a capability
+        
+        Rediscovers first if the registry is older than discovery_ttl or refresh is set;
+        otherwise answers from the cached registry.
+        """
+        self.mark_activity()
+        if refresh or self._discovered_at is None or time.monotonic() - self._discovered_at >= self.discovery_ttl:
+            await self._discover_agents()
+        
+        if capability is None:
+            return self.get_all_agents()
+        return list(self._cap_index.get(capability.lower(), ()))
+    
+    def _rebuild_indexes(self):
+        """Rebuild the capability and file operation indexes from the registry, in registry order"""
+        cap_index: Dict[str, List[A2AAgentInfo]] = {}
+        for agent in self.agent_registry.values():
+            for capability in agent.capabilities:
+                cap_index.setdefault(capability, []).append(agent)
+        
+        self._cap_index = cap_index
+        self._operation_index = {
+            operation: [agent for agent in self.agent_registry.values() if capabilities & agent.capabilities]
+            for operation, capabilities in OPERATION_CAPABILITIES.items()
+        }
     
     def get_agent_by_capability(self, capability: str) -> Optional[A2AAgentInfo]:
         """Find an agent that has the specified capability"""
-        for agent in self.agent_registry.values():
-            if capability in agent.capabilities:
-                return agent
-        return None
+        agents = self._cap_index.get(capability.lower())
+        return agents[0] if agents else None
     
     def get_all_agents(self) -> List[A2AAgentInfo]:
         """Get all discovered agents"""
@@ -144,22 +277,7 @@ class A2AConfig:
     
     def get_agents_for_file_operation(self, operation: str) -> List[A2AAgentInfo]:
         """Get agents suitable for a specific file operation"""
-        operation_capabilities = {
-            "read": ["document_processing", "text_extraction"],
-            "write": ["document_processing", "format_conversion"],
-            "analyze": ["code_analysis", "data_analysis", "image_analysis"],
-            "backup": ["backup_management", "file_synchronization"],
-            "convert": ["format_conversion", "image_conversion"]
-        }
-        
-        capabilities = operation_capabilities.get(operation, [])
-        suitable_agents = []
-        
-        for agent in self.agent_registry.values():
-            if any(cap in agent.capabilities for cap in capabilities):
-                suitable_agents.append(agent)
-        
-        return suitable_agents
+        return list(self._operation_index.get(operation, ()))
 
 # Global A2A configuration instance
 a2a_config = A2AConfig() 
\ No newline at end of file
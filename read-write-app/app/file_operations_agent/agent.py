@@ -4,27 +4,133 @@ No simulations - performs actual file operations and monitors workspace for file
 """
 
 import os
+import re
 import json
+import stat
+import signal
+import tempfile
 import asyncio
+import functools
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
+
+try:
+    from watchfiles import awatch
+except ImportError:
+    awatch = None
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 # Load environment variables from root .env
 load_dotenv(dotenv_path="../../../.env")
 
+# Bounded pool for blocking file I/O so concurrent tasks can overlap disk latency off the event loop
+_IO_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("FILE_IO_WORKERS", min(32, (os.cpu_count() or 1) * 4))),
+    thread_name_prefix="file_io"
+)
+
+# os.open flags for write_file modes
+_WRITE_FLAGS = {
+    "w": os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC,
+    "a": os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC,
+}
+
+# Read size once a file's stat'ed length has been consumed
+_READ_CHUNK = 64 * 1024
+
+# Paths per `git add` invocation, well under the platform argument length limit
+_GIT_ADD_CHUNK = 4096
+
+# System instruction for the file operations agent
+FILE_OPERATIONS_INSTRUCTION = """You are a file operations agent that performs real file and directory operations.
+
+Your capabilities:
+1. **File Operations**: Read, write, create, delete files with proper error handling
+2. **Directory Management**: Create directories, list contents, organize file structures
+3. **Git Operations**: Commit changes, track workspace history with meaningful messages
+4. **Batch Processing**: Handle multiple file operations efficiently
+5. **Workspace Management**: Maintain clean, organized workspace structure
+
+You monitor the workspace for file-related tasks and execute them autonomously with proper safety checks."""
+
+# Operation keywords in task descriptions, found in a single pass (substring matches, like `in`)
+_OPERATION_RE = re.compile(r"write|create|read|list|directory", re.IGNORECASE)
+
+# Keywords that mark a task description as a file task, found in a single pass (substring matches, like `in`)
+_FILE_KEYWORD_RE = re.compile(r"file|write|read|create|delete|directory|folder|save", re.IGNORECASE)
+
+# File named in a task description: the first whitespace-separated word containing a dot,
+# which for output files must also be a bare name (no "/")
+_INPUT_FILE_RE = re.compile(r"(?<!\S)\S*\.\S*")
+_OUTPUT_FILE_RE = re.compile(r"(?<!\S)[^\s/]*\.[^\s/]*(?!\S)")
+
+# Task handlers in priority order, each with the operation keywords that select it
+_TASK_HANDLERS = (
+    (frozenset({"write", "create"}), "_write_task_output"),
+    (frozenset({"read"}), "_read_task_file"),
+    (frozenset({"list", "directory"}), "_list_task_directory")
+)
+
+def _is_task_file(change, path: str) -> bool:
+    """watchfiles filter: only changes to task.json files matter to the monitor"""
+    return os.path.basename(path) == "task.json"
+
+def _tool_errors(label: str):
+    """Decorate a tool method so any exception becomes a {"success": False, "error": "<label>: <exc>"} result"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": f"{label}: {str(e)}"
+                }
+        return wrapper
+    return decorator
+
 class FileOperationsAgent:
     """Real File Operations Agent with workspace task monitoring"""
     
     def __init__(self):
-        # Store workspace paths in global scope for access in methods
-        global workspace_path, current_tasks_dir
-        workspace_path = Path(os.getenv("GIT_WORKSPACE_PATH", "./workspace"))
-        current_tasks_dir = workspace_path / "current_tasks"
+        # Workspace paths, per instance so several agents can share a process
+        self.workspace_path = Path(os.getenv("GIT_WORKSPACE_PATH", "./workspace"))
+        self.current_tasks_dir = self.workspace_path / "current_tasks"
+        self._workspace_prefix = os.path.join(str(self.workspace_path), "")
         self.agent_id = "file_operations_agent"
         
+        # Seconds between workspace scans when not watching for changes
+        self._poll_interval = int(os.getenv("TASK_MONITOR_INTERVAL", "3"))
+        
+        # Workspace repository for in-process commits, opened on the first commit
+        self._git_repo = None
+        
+        # Set by stop() to end the workspace monitor
+        self._stop = asyncio.Event()
+        
+        # Watch current_tasks for changes instead of polling it (needs watchfiles)
+        self.watch_workspace = os.getenv("WATCH_WORKSPACE", "true").lower() == "true"
+        
+        # Caps how many workspace tasks are processed at once
+        self._task_sem = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_FILE_TASKS", "3")))
+        
+        # Task dirs whose task.json was not claimable when last parsed, keyed to that file's stat stamp
+        self._skipped_tasks: Dict[Path, tuple] = {}
+        
+        # Caps how many paths of one process_file_batch call are in flight on the I/O pool,
+        # so a large batch cannot queue ahead of everything else sharing the pool
+        self._batch_concurrency = int(os.getenv("MAX_CONCURRENT_BATCH_PATHS", "32"))
+        
         # Define tools for the ADK agent
         tools = [
             FunctionTool(self.read_file),
@@ -41,21 +147,19 @@ class FileOperationsAgent:
             name="file_operations_agent",
             model=os.getenv("READ_WRITE_MODEL", "gemini-2.0-flash"),
             description="Real File Operations Agent - performs actual file operations and git management",
-            instruction="""You are a file operations agent that performs real file and directory operations.
-
-Your capabilities:
-1. **File Operations**: Read, write, create, delete files with proper error handling
-2. **Directory Management**: Create directories, list contents, organize file structures
-3. **Git Operations**: Commit changes, track workspace history with meaningful messages
-4. **Batch Processing**: Handle multiple file operations efficiently
-5. **Workspace Management**: Maintain clean, organized workspace structure
-
-You monitor the workspace for file-related tasks and execute them autonomously with proper safety checks.""",
+            instruction=FILE_OPERATIONS_INSTRUCTION,
             tools=tools
         )
         
-    @FunctionTool
-    def read_file(self, file_path: str) -> Dict[str, Any]:
+    def _resolve(self, path: str) -> str:
+        """Resolve a tool path: absolute paths as given, anything else relative to the workspace"""
+        return path if path.startswith('/') else self._workspace_prefix + path
+    
+    async def _run_io(self, func, *args):
+        """Run a blocking file operation on the I/O pool"""
+        return await asyncio.get_running_loop().run_in_executor(_IO_POOL, func, *args)
+    
+    async def read_file(self, file_path: str) -> Dict[str, Any]:
         """Read a file from the workspace
         
         Args:
@@ -64,45 +168,51 @@ You monitor the workspace for file-related tasks and execute them autonomously w
         Returns:
             Dict containing file content and metadata
         """
+        return await self._run_io(self._read_file_sync, file_path)
+    
+    @_tool_errors("Failed to read file")
+    def _read_file_sync(self, file_path: str) -> Dict[str, Any]:
+        """Blocking body of read_file"""
+        # Resolve path relative to workspace
+        full_path = self._resolve(file_path)
+        
+        # Open first and stat the open descriptor once, rather than stat'ing the path for each check
         try:
-            # Resolve path relative to workspace
-            if not file_path.startswith('/'):
-                full_path = workspace_path / file_path
-            else:
-                full_path = Path(file_path)
-            
-            if not full_path.exists():
-                return {
-                    "success": False,
-                    "error": f"File not found: {file_path}"
-                }
-            
-            if not full_path.is_file():
+            fd = os.open(full_path, os.O_RDONLY | os.O_CLOEXEC)
+        except FileNotFoundError:
+            return {
+                "success": False,
+                "error": f"File not found: {file_path}"
+            }
+        
+        # Read file content straight from the descriptor, without a buffered text wrapper
+        try:
+            info = os.fstat(fd)
+            if not stat.S_ISREG(info.st_mode):
                 return {
                     "success": False,
                     "error": f"Path is not a file: {file_path}"
                 }
-            
-            # Read file content
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "content": content,
-                "size": full_path.stat().st_size,
-                "modified": full_path.stat().st_mtime
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to read file: {str(e)}"
-            }
+            chunks = [os.read(fd, info.st_size or _READ_CHUNK)]
+            while chunks[-1]:
+                chunks.append(os.read(fd, _READ_CHUNK))
+        finally:
+            os.close(fd)
+        
+        content = b"".join(chunks).decode('utf-8')
+        if '\r' in content:
+            # Same newline translation as reading in text mode
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "content": content,
+            "size": info.st_size,
+            "modified": info.st_mtime
+        }
     
-    @FunctionTool
-    def write_file(self, file_path: str, content: str, mode: str = "w") -> Dict[str, Any]:
+    async def write_file(self, file_path: str, content: str, mode: str = "w") -> Dict[str, Any]:
         """Write content to a file in the workspace
         
         Args:
@@ -113,35 +223,40 @@ You monitor the workspace for file-related tasks and execute them autonomously w
         Returns:
             Dict containing write operation results
         """
+        return await self._run_io(self._write_file_sync, file_path, content, mode)
+    
+    @_tool_errors("Failed to write file")
+    def _write_file_sync(self, file_path: str, content: str, mode: str = "w") -> Dict[str, Any]:
+        """Blocking body of write_file"""
+        # Resolve path relative to workspace
+        full_path = self._resolve(file_path)
+        
+        # Create parent directories if they don't exist
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        
+        # Encode once and write those bytes; a truncating write leaves the file exactly bytes_written long
+        data = content.encode('utf-8')
+        bytes_written = len(data)
+        if mode not in _WRITE_FLAGS:
+            raise ValueError(f"invalid mode: '{mode}'")
+        fd = os.open(full_path, _WRITE_FLAGS[mode], 0o666)
         try:
-            # Resolve path relative to workspace
-            if not file_path.startswith('/'):
-                full_path = workspace_path / file_path
-            else:
-                full_path = Path(file_path)
-            
-            # Create parent directories if they don't exist
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Write file content
-            with open(full_path, mode, encoding='utf-8') as f:
-                f.write(content)
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "bytes_written": len(content.encode('utf-8')),
-                "mode": mode,
-                "size": full_path.stat().st_size
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to write file: {str(e)}"
-            }
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            size = bytes_written if mode == "w" else os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "bytes_written": bytes_written,
+            "mode": mode,
+            "size": size
+        }
 
-    @FunctionTool
+    @_tool_errors("Failed to create file")
     def create_file(self, file_path: str, content: str = "") -> Dict[str, Any]:
         """Create a new file with optional initial content
         
@@ -152,40 +267,30 @@ You monitor the workspace for file-related tasks and execute them autonomously w
         Returns:
             Dict containing creation results
         """
+        # Resolve path relative to workspace
+        full_path = self._resolve(file_path)
+        
+        # Create parent directories if they don't exist
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        
+        # Create file with content; exclusive mode does the existence check as part of the open
         try:
-            # Resolve path relative to workspace
-            if not file_path.startswith('/'):
-                full_path = workspace_path / file_path
-            else:
-                full_path = Path(file_path)
-            
-            if full_path.exists():
-                return {
-                    "success": False,
-                    "error": f"File already exists: {file_path}"
-                }
-            
-            # Create parent directories if they don't exist
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Create file with content
-            with open(full_path, 'w', encoding='utf-8') as f:
+            with open(full_path, 'x', encoding='utf-8') as f:
                 f.write(content)
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "created": True,
-                "size": full_path.stat().st_size
-            }
-            
-        except Exception as e:
+        except FileExistsError:
             return {
                 "success": False,
-                "error": f"Failed to create file: {str(e)}"
+                "error": f"File already exists: {file_path}"
             }
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "created": True,
+            "size": len(content.encode('utf-8'))
+        }
 
-    @FunctionTool
+    @_tool_errors("Failed to delete file")
     def delete_file(self, file_path: str) -> Dict[str, Any]:
         """Delete a file from the workspace
         
@@ -195,41 +300,31 @@ You monitor the workspace for file-related tasks and execute them autonomously w
         Returns:
             Dict containing deletion results
         """
-        try:
-            # Resolve path relative to workspace
-            if not file_path.startswith('/'):
-                full_path = workspace_path / file_path
-            else:
-                full_path = Path(file_path)
-            
-            if not full_path.exists():
-                return {
-                    "success": False,
-                    "error": f"File not found: {file_path}"
-                }
-            
-            if not full_path.is_file():
-                return {
-                    "success": False,
-                    "error": f"Path is not a file: {file_path}"
-                }
-            
-            # Delete the file
-            full_path.unlink()
-            
+        # Resolve path relative to workspace
+        full_path = self._resolve(file_path)
+        
+        if not os.path.exists(full_path):
             return {
-                "success": True,
-                "file_path": file_path,
-                "deleted": True
+                "success": False,
+                "error": f"File not found: {file_path}"
             }
-            
-        except Exception as e:
+        
+        if not os.path.isfile(full_path):
             return {
                 "success": False,
-                "error": f"Failed to delete file: {str(e)}"
+                "error": f"Path is not a file: {file_path}"
             }
+        
+        # Delete the file
+        os.unlink(full_path)
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "deleted": True
+        }
     
-    @FunctionTool
+    @_tool_errors("Failed to list directory")
     def list_directory(self, directory_path: str = ".") -> Dict[str, Any]:
         """List contents of a directory
         
@@ -239,51 +334,41 @@ You monitor the workspace for file-related tasks and execute them autonomously w
         Returns:
             Dict containing directory contents
         """
-        try:
-            # Resolve path relative to workspace
-            if directory_path == "." or directory_path == "":
-                full_path = workspace_path
-            elif not directory_path.startswith('/'):
-                full_path = workspace_path / directory_path
-            else:
-                full_path = Path(directory_path)
-            
-            if not full_path.exists():
-                return {
-                    "success": False,
-                    "error": f"Directory not found: {directory_path}"
-                }
-            
-            if not full_path.is_dir():
-                return {
-                    "success": False,
-                    "error": f"Path is not a directory: {directory_path}"
-                }
-            
-            # List directory contents
-            contents = []
-            for item in full_path.iterdir():
-                contents.append({
-                    "name": item.name,
-                    "type": "directory" if item.is_dir() else "file",
-                    "size": item.stat().st_size if item.is_file() else None,
-                    "modified": item.stat().st_mtime
-                })
-            
+        # Resolve path relative to workspace
+        full_path = self._resolve(directory_path)
+        
+        if not os.path.exists(full_path):
             return {
-                "success": True,
-                "directory_path": directory_path,
-                "contents": sorted(contents, key=lambda x: (x["type"], x["name"])),
-                "total_items": len(contents)
+                "success": False,
+                "error": f"Directory not found: {directory_path}"
             }
-            
-        except Exception as e:
+        
+        if not os.path.isdir(full_path):
             return {
                 "success": False,
-                "error": f"Failed to list directory: {str(e)}"
+                "error": f"Path is not a directory: {directory_path}"
             }
+        
+        # List directory contents; DirEntry answers the type checks from the directory read and caches its stat
+        contents = []
+        with os.scandir(full_path) as entries:
+            for entry in entries:
+                info = entry.stat()
+                contents.append({
+                    "name": entry.name,
+                    "type": "directory" if entry.is_dir() else "file",
+                    "size": info.st_size if entry.is_file() else None,
+                    "modified": info.st_mtime
+                })
+        
+        return {
+            "success": True,
+            "directory_path": directory_path,
+            "contents": sorted(contents, key=lambda x: (x["type"], x["name"])),
+            "total_items": len(contents)
+        }
 
-    @FunctionTool
+    @_tool_errors("Failed to create directory")
     def create_directory(self, directory_path: str) -> Dict[str, Any]:
         """Create a new directory
         
@@ -293,35 +378,25 @@ You monitor the workspace for file-related tasks and execute them autonomously w
         Returns:
             Dict containing creation results
         """
-        try:
-            # Resolve path relative to workspace
-            if not directory_path.startswith('/'):
-                full_path = workspace_path / directory_path
-            else:
-                full_path = Path(directory_path)
-            
-            if full_path.exists():
-                return {
-                    "success": False,
-                    "error": f"Directory already exists: {directory_path}"
-                }
-            
-            # Create directory
-            full_path.mkdir(parents=True, exist_ok=True)
-            
-            return {
-                "success": True,
-                "directory_path": directory_path,
-                "created": True
-            }
-            
-        except Exception as e:
+        # Resolve path relative to workspace
+        full_path = self._resolve(directory_path)
+        
+        if os.path.exists(full_path):
             return {
                 "success": False,
-                "error": f"Failed to create directory: {str(e)}"
+                "error": f"Directory already exists: {directory_path}"
             }
+        
+        # Create directory
+        os.makedirs(full_path, exist_ok=True)
+        
+        return {
+            "success": True,
+            "directory_path": directory_path,
+            "created": True
+        }
     
-    @FunctionTool
+    @_tool_errors("Git commit failed")
     def git_commit(self, message: str, files: Optional[List[str]] = None) -> Dict[str, Any]:
         """Commit changes to git repository
         
@@ -332,170 +407,214 @@ You monitor the workspace for file-related tasks and execute them autonomously w
         Returns:
             Dict containing commit results
         """
+        if pygit2 is not None:
+            return self._git_commit_libgit2(message, files)
+        return self._git_commit_subprocess(message, files)
+    
+    def _git_commit_libgit2(self, message: str, files: Optional[List[str]]) -> Dict[str, Any]:
+        """Stage and commit in-process through libgit2"""
+        if self._git_repo is None:
+            self._git_repo = pygit2.Repository(str(self.workspace_path))
+        repo = self._git_repo
+        
+        # Stage like `git add`: new and modified files, plus removals of deleted tracked files
+        deleted = [
+            path for path, flags in repo.status().items()
+            if flags & pygit2.GIT_STATUS_WT_DELETED
+            and (not files or any(path == f or path.startswith(f.rstrip("/") + "/") for f in files))
+        ]
+        index = repo.index
+        index.read()
+        index.add_all(files or [])
+        if deleted:
+            index.remove_all(deleted)
+        index.write()
+        tree = index.write_tree()
+        
+        parents = [] if repo.head_is_unborn else [repo.head.target]
+        if parents and repo[parents[0]].tree_id == tree:
+            return {
+                "success": False,
+                "error": "Nothing to commit"
+            }
+        
         try:
-            import subprocess
-            import os
-            
-            # Change to workspace directory
-            original_cwd = os.getcwd()
-            os.chdir(workspace_path)
-            
-            try:
-                # Add files to git
-                if files:
-                    for file_path in files:
-                        subprocess.run(['git', 'add', file_path], check=True)
-                else:
-                    subprocess.run(['git', 'add', '.'], check=True)
-                
-                # Commit changes
-                result = subprocess.run(['git', 'commit', '-m', message], 
-                                      capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    return {
-                        "success": True,
-                        "message": f"Committed: {message}",
-                        "output": result.stdout
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": result.stderr or "Git commit failed"
-                    }
-                    
-            finally:
-                # Restore original directory
-                os.chdir(original_cwd)
-            
-        except Exception as e:
+            signature = repo.default_signature
+        except (KeyError, pygit2.GitError):
+            signature = pygit2.Signature(
+                os.getenv("GIT_USER_NAME", "Orchestration Agent"),
+                os.getenv("GIT_USER_EMAIL", "orchestration@example.com")
+            )
+        
+        commit_id = repo.create_commit("HEAD", signature, signature, message, tree, parents)
+        return {
+            "success": True,
+            "message": f"Committed: {message}",
+            "output": f"[{str(commit_id)[:7]}] {message}"
+        }
+    
+    def _git_commit_subprocess(self, message: str, files: Optional[List[str]]) -> Dict[str, Any]:
+        """Stage and commit by running the git CLI"""
+        import subprocess
+        
+        # Run git in the workspace without touching the process-wide working directory
+        cwd = str(self.workspace_path)
+        
+        # Add files to git, in as few invocations as the argument length limit allows
+        if files:
+            for start in range(0, len(files), _GIT_ADD_CHUNK):
+                subprocess.run(['git', 'add', '--', *files[start:start + _GIT_ADD_CHUNK]],
+                               cwd=cwd, check=True, capture_output=True, text=True)
+        else:
+            subprocess.run(['git', 'add', '.'], cwd=cwd, check=True, capture_output=True, text=True)
+        
+        # Commit changes
+        result = subprocess.run(['git', 'commit', '-m', message], 
+                              cwd=cwd, capture_output=True, text=True)
+        
+        if result.returncode == 0:
+            return {
+                "success": True,
+                "message": f"Committed: {message}",
+                "output": result.stdout
+            }
+        else:
             return {
                 "success": False,
-                "error": f"Git commit failed: {str(e)}"
+                "error": result.stderr or "Git commit failed"
             }
     
-    @FunctionTool
-    def process_file_batch(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def process_file_batch(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Process multiple file operations in batch
         
+        Operations on different paths run concurrently (up to MAX_CONCURRENT_BATCH_PATHS
+        paths at a time); operations on the same path run in the order given, together
+        in a single I/O pool job.
+        
         Args:
             operations: List of operations, each with 'type' and relevant parameters
             
         Returns:
             Dict containing batch operation results
         """
-        results = []
-        successful = 0
-        failed = 0
-        
+        chains: Dict[str, List[int]] = {}
         for i, op in enumerate(operations):
-            op_type = op.get("type")
-            
-            try:
-                if op_type == "write":
-                    result = self.write_file(op["file_path"], op["content"], op.get("mode", "w"))
-                elif op_type == "read":
-                    result = self.read_file(op["file_path"])
-                elif op_type == "create":
-                    result = self.create_file(op["file_path"], op.get("content", ""))
-                elif op_type == "delete":
-                    result = self.delete_file(op["file_path"])
-                elif op_type == "create_dir":
-                    result = self.create_directory(op["directory_path"])
-                else:
-                    result = {"success": False, "error": f"Unknown operation type: {op_type}"}
-                
-                results.append({"operation": i, "type": op_type, "result": result})
-                
-                if result.get("success"):
-                    successful += 1
-                else:
-                    failed += 1
-                    
-            except Exception as e:
-                results.append({
-                    "operation": i, 
-                    "type": op_type, 
-                    "result": {"success": False, "error": str(e)}
-                })
-                failed += 1
-            
-            return {
+            key = op.get("file_path") or op.get("directory_path") or f"#{i}"
+            chains.setdefault(key, []).append(i)
+        
+        results: List[Dict[str, Any]] = [None] * len(operations)
+        limit = asyncio.Semaphore(self._batch_concurrency)
+        async with asyncio.TaskGroup() as tg:
+            chain_tasks = [
+                tg.create_task(self._run_batch_chain_bounded(limit, operations, indexes))
+                for indexes in chains.values()
+            ]
+        for task in chain_tasks:
+            for entry in task.result():
+                results[entry["operation"]] = entry
+        
+        total = len(results)
+        failed = sum(1 for entry in results if not entry["result"].get("success"))
+        return {
             "success": failed == 0,
-            "total_operations": len(operations),
-            "successful": successful,
+            "total_operations": total,
+            "successful": total - failed,
             "failed": failed,
             "results": results
         }
+    
+    async def _run_batch_chain_bounded(self, limit: asyncio.Semaphore, operations: List[Dict[str, Any]],
+                                       indexes: List[int]) -> List[Dict[str, Any]]:
+        """Run one process_file_batch path chain on the I/O pool once the batch has a free slot"""
+        async with limit:
+            return await self._run_io(self._run_batch_chain, operations, indexes)
+    
+    def _run_batch_chain(self, operations: List[Dict[str, Any]], indexes: List[int]) -> List[Dict[str, Any]]:
+        """Run, in order, the process_file_batch operations that target one path (blocking)"""
+        return [self._run_batch_operation(i, operations[i]) for i in indexes]
+    
+    def _run_batch_operation(self, index: int, op: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single operation from process_file_batch (blocking)"""
+        op_type = op.get("type")
+        
+        try:
+            if op_type == "write":
+                result = self._write_file_sync(op["file_path"], op["content"], op.get("mode", "w"))
+            elif op_type == "read":
+                result = self._read_file_sync(op["file_path"])
+            elif op_type == "create":
+                result = self.create_file(op["file_path"], op.get("content", ""))
+            elif op_type == "delete":
+                result = self.delete_file(op["file_path"])
+            elif op_type == "create_dir":
+                result = self.create_directory(op["directory_path"])
+            else:
+                result = {"success": False, "error": f"Unknown operation type: {op_type}"}
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        
+        return {"operation": index, "type": op_type, "result": result}
 
     def can_handle_task(self, task_data: Dict[str, Any]) -> bool:
         """Check if this agent can handle the given task"""
-        task_type = task_data.get("agent_type", "").lower()
-        description = task_data.get("description", "").lower()
-        
         # Handle file-related tasks
-        if task_type == "file":
+        if task_data.get("agent_type", "").lower() == "file":
             return True
             
         # Handle tasks with file operation keywords
-        file_keywords = ["file", "write", "read", "create", "delete", "directory", "folder", "save"]
-        return any(keyword in description for keyword in file_keywords)
+        return _FILE_KEYWORD_RE.search(task_data.get("description", "")) is not None
+
+    async def _write_task_output(self, description: str) -> Dict[str, Any]:
+        """Write a task's output to the file named in its description"""
+        # Extract file path and content from description
+        # Simple parsing - in production would use better NLP
+        match = _OUTPUT_FILE_RE.search(description)
+        file_path = match.group(0) if match else "task_output.txt"
+        
+        return await self.write_file(file_path, f"Output from task: {description}")
+    
+    async def _read_task_file(self, description: str) -> Dict[str, Any]:
+        """Read the file named in a task's description"""
+        # Extract file path from description
+        match = _INPUT_FILE_RE.search(description)
+        if match:
+            return await self.read_file(match.group(0))
+        return {"success": False, "error": "No file path specified"}
+    
+    async def _list_task_directory(self, description: str) -> Dict[str, Any]:
+        """List the workspace root for a task"""
+        return await self._run_io(self.list_directory)
 
     async def process_task(self, task_path: Path):
-        """Process a file operations task"""
+        """Process a file operations task
+        
+        The task is claimed by renaming its task.json to task.json.claimed.<agent_id>,
+        which only one agent can do. The finished task is then written to task.json in a
+        single atomic replace; a task that errors out is renamed back unchanged.
+        """
+        claimed_file = await self._run_io(self._claim_task, task_path)
+        if claimed_file is None:
+            print(f"📁 Task {task_path.name} was claimed by another agent")
+            return
+        
+        finished = False
         try:
             # Load task
-            with open(task_path / "task.json", 'r') as f:
-                task_data = json.load(f)
+            task_data = await self._run_io(self._load_task, claimed_file)
+            if task_data.get("status") != "available":
+                return
             
-            # Claim the task
-            task_data["status"] = "in_progress"
+            # Claim the task; the claim itself is the renamed file, so this is only recorded with the result
             task_data["claimed_by"] = self.agent_id
             task_data["claimed_at"] = time.time()
             
-            with open(task_path / "task.json", 'w') as f:
-                json.dump(task_data, f, indent=2)
-            
             # Execute the task based on description
             description = task_data["description"]
-            result = None
+            operations = {match.group(0).lower() for match in _OPERATION_RE.finditer(description)}
+            handler = next((name for keywords, name in _TASK_HANDLERS if keywords & operations), None)
             
-            if "write" in description.lower() or "create" in description.lower():
-                # Extract file path and content from description
-                # Simple parsing - in production would use better NLP
-                words = description.split()
-                file_path = None
-                content = description  # Default content
-                
-                for word in words:
-                    if "." in word and "/" not in word:  # Simple file detection
-                        file_path = word
-                        break
-                
-                if not file_path:
-                    file_path = "task_output.txt"
-                
-                result = self.write_file(file_path, f"Output from task: {description}")
-                
-            elif "read" in description.lower():
-                # Extract file path from description
-                words = description.split()
-                file_path = None
-                
-                for word in words:
-                    if "." in word:
-                        file_path = word
-                        break
-                
-                if file_path:
-                    result = self.read_file(file_path)
-                else:
-                    result = {"success": False, "error": "No file path specified"}
-                    
-            elif "list" in description.lower() or "directory" in description.lower():
-                # List directory contents
-                result = self.list_directory()
-                
+            if handler:
+                result = await getattr(self, handler)(description)
             else:
                 # Generic file operation
                 result = {"success": False, "error": "Could not determine file operation"}
@@ -511,64 +630,166 @@ You monitor the workspace for file-related tasks and execute them autonomously w
             task_data["result"] = result
             task_data["completed_at"] = time.time()
             
-            with open(task_path / "task.json", 'w') as f:
-                json.dump(task_data, f, indent=2)
+            await self._run_io(self._save_task, task_path / "task.json", task_data)
+            finished = True
+            await self._run_io(claimed_file.unlink)
             
             # Log progress
-            with open(task_path / "progress.log", 'a') as f:
-                status = "✅ COMPLETED" if result and result.get("success") else "❌ FAILED"
-                f.write(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] {status} - File Operations Agent\n")
-                f.write(f"Operation: {description}\n")
-                if result and result.get("success"):
-                    f.write(f"Result: Operation successful\n")
-                    if result.get("committed"):
-                        f.write(f"Changes committed to git\n")
-                else:
-                    f.write(f"Error: {result.get('error', 'Unknown error') if result else 'No result'}\n")
+            await self._run_io(self._log_progress, task_path, description, result)
             
         except Exception as e:
             print(f"Error processing task {task_path.name}: {e}")
+        
+        finally:
+            if not finished:
+                try:
+                    await self._run_io(os.replace, claimed_file, task_path / "task.json")
+                except OSError as e:
+                    print(f"Error releasing task {task_path.name}: {e}")
+    
+    def _claim_task(self, task_path: Path) -> Optional[Path]:
+        """Atomically take a task's task.json for this agent (blocking)
+        
+        Returns the claimed file, or None if another agent took the task first.
+        """
+        claimed_file = task_path / f"task.json.claimed.{self.agent_id}"
+        try:
+            os.rename(task_path / "task.json", claimed_file)
+        except FileNotFoundError:
+            return None
+        return claimed_file
+    
+    def _load_task(self, task_file: Path) -> Dict[str, Any]:
+        """Read a task file (blocking)"""
+        with open(task_file, 'r') as f:
+            return json.load(f)
+    
+    def _save_task(self, task_file: Path, task_data: Dict[str, Any]):
+        """Atomically replace a task file (blocking)
+        
+        Writes to a temporary file beside it and renames that over the task file, so
+        readers see either the old contents or the new ones, never a partial write.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=task_file.parent, prefix=".task-", suffix=".json")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(task_data, f, indent=2)
+            os.replace(tmp_path, task_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def _log_progress(self, task_path: Path, description: str, result: Optional[Dict[str, Any]]):
+        """Append a task's outcome to its progress.log in a single write (blocking)"""
+        status = "✅ COMPLETED" if result and result.get("success") else "❌ FAILED"
+        lines = [
+            f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] {status} - File Operations Agent\n",
+            f"Operation: {description}\n"
+        ]
+        if result and result.get("success"):
+            lines.append(f"Result: Operation successful\n")
+            if result.get("committed"):
+                lines.append(f"Changes committed to git\n")
+        else:
+            lines.append(f"Error: {result.get('error', 'Unknown error') if result else 'No result'}\n")
+        
+        fd = os.open(task_path / "progress.log", _WRITE_FLAGS["a"], 0o666)
+        try:
+            os.write(fd, "".join(lines).encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    async def _process_task_bounded(self, task_path: Path):
+        """Process a task once a concurrency slot is free"""
+        async with self._task_sem:
+            print(f"📁 Claiming file operations task: {task_path.name}")
+            await self.process_task(task_path)
+
+    async def _process_available_tasks(self, task_dirs, full_scan: bool = False):
+        """Claim and process the available tasks we can handle among task_dirs
+        
+        A task.json already found to be unavailable or not ours is only parsed again once
+        it changes; full_scan means task_dirs is every task, so stale entries are dropped.
+        """
+        # Check for available tasks, then process them concurrently (bounded by _task_sem)
+        claimable = []
+        seen = set()
+        for task_dir in task_dirs:
+            task_file = task_dir / "task.json"
+            try:
+                info = os.stat(task_file)
+            except OSError:
+                self._skipped_tasks.pop(task_dir, None)
+                continue
+            
+            # Rewrites, including atomic replaces, change at least one of these
+            stamp = (info.st_ino, info.st_mtime_ns, info.st_size)
+            seen.add(task_dir)
+            if self._skipped_tasks.get(task_dir) == stamp:
+                continue
+            
+            try:
+                with open(task_file, 'r') as f:
+                    task_data = json.load(f)
+                
+                # Skip if task is not available or not for us
+                if task_data.get("status") != "available" or not self.can_handle_task(task_data):
+                    self._skipped_tasks[task_dir] = stamp
+                    continue
+                
+                self._skipped_tasks.pop(task_dir, None)
+                claimable.append(task_dir)
+                
+            except Exception as e:
+                print(f"Error checking task {task_dir.name}: {e}")
+        
+        if full_scan:
+            self._skipped_tasks = {task_dir: stamp for task_dir, stamp in self._skipped_tasks.items() if task_dir in seen}
+        
+        async with asyncio.TaskGroup() as tg:
+            for task_dir in claimable:
+                tg.create_task(self._process_task_bounded(task_dir))
+
+    async def _watch_tasks(self):
+        """Process tasks as their task.json files change, until stop() is called"""
+        async for changes in awatch(self.current_tasks_dir, watch_filter=_is_task_file, stop_event=self._stop):
+            await self._process_available_tasks({Path(path).parent for _, path in changes})
 
     async def monitor_workspace(self):
-        """Monitor workspace for file operation tasks"""
-        print(f"📁 File Operations Agent monitoring workspace: {current_tasks_dir}")
+        """Monitor workspace for file operation tasks
         
-        while True:
+        With watchfiles installed, a full scan picks up existing tasks and file system
+        notifications drive everything after that; otherwise the workspace is polled.
+        """
+        print(f"📁 File Operations Agent monitoring workspace: {self.current_tasks_dir}")
+        
+        while not self._stop.is_set():
             try:
-                if not current_tasks_dir.exists():
-                    await asyncio.sleep(int(os.getenv("TASK_MONITOR_INTERVAL", 3)))
+                if not self.current_tasks_dir.exists():
+                    await self._idle(self._poll_interval)
                     continue
                 
-                # Check for available tasks
-                for task_dir in current_tasks_dir.iterdir():
-                    if not task_dir.is_dir():
-                        continue
-                    
-                    task_file = task_dir / "task.json"
-                    if not task_file.exists():
-                        continue
-                    
-                    try:
-                        with open(task_file, 'r') as f:
-                            task_data = json.load(f)
-                        
-                        # Skip if task is not available or not for us
-                        if task_data.get("status") != "available":
-                            continue
-                        
-                        if not self.can_handle_task(task_data):
-                            continue
-                        
-                        print(f"📁 Claiming file operations task: {task_dir.name}")
-                        await self.process_task(task_dir)
-                        
-                    except Exception as e:
-                        print(f"Error checking task {task_dir.name}: {e}")
+                await self._process_available_tasks(self.current_tasks_dir.iterdir(), full_scan=True)
+                
+                if awatch is not None and self.watch_workspace:
+                    await self._watch_tasks()
+                    continue
                 
             except Exception as e:
                 print(f"Error in workspace monitoring: {e}")
             
-            await asyncio.sleep(int(os.getenv("TASK_MONITOR_INTERVAL", 3)))
+            await self._idle(self._poll_interval)
+
+    async def _idle(self, seconds: float):
+        """Wait between workspace scans, returning as soon as stop() is called"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+    
+    def stop(self):
+        """Ask the workspace monitor to finish its current scan and exit"""
+        self._stop.set()
 
     async def run(self):
         """Run the file operations agent"""
@@ -580,10 +801,26 @@ You monitor the workspace for file-related tasks and execute them autonomously w
         print("- Batch operation processing")
         print("- Safe file handling with error checking")
         
+        # Shut down cleanly on Ctrl+C / SIGTERM (signal handlers are unavailable on Windows)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except NotImplementedError:
+                pass
+        
         await self.monitor_workspace()
+        print("📁 File Operations Agent shutting down...")
+        _IO_POOL.shutdown(wait=True)
         
 # Create agent instance
 file_operations_agent = FileOperationsAgent()
 
 if __name__ == "__main__":
-    asyncio.run(file_operations_agent.run()) 
\ No newline at end of file
+    # Prefer uvloop's faster event loop if available
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    use_uvloop = uvloop is not None and os.getenv("USE_UVLOOP", "true").lower() == "true"
+    (uvloop.run if use_uvloop else asyncio.run)(file_operations_agent.run()) 
\ No newline at end of file
@@ -7,26 +7,16 @@ import os
 import asyncio
 from typing import Dict, List, Optional, Any
 from google.adk.agents import Agent, SequentialAgent, ParallelAgent, LoopAgent
+from google.adk.models import Gemini
 from google.adk.tools import AgentTool
 from .tools import file_tools
 
-class FileOperationsCoordinator:
-    """Coordinates multiple agents for file operations"""
-    
-    def __init__(self):
-        self.agents = {}
-        self.a2a_agents = {}
-        self._setup_agents()
-    
-    def _setup_agents(self):
-        """Setup the specialized agents"""
-        
-        # File Reader Agent - Specialized in reading and analyzing files
-        self.agents["file_reader"] = Agent(
-            name="file_reader",
-            model=os.getenv("GEMINI_MODEL", "gemini-2.0-flash-live-001"),
-            description="Specialized agent for reading and analyzing files in the workspace",
-            instruction="""You are a file reading specialist. Your job is to:
+# Specialized agents: (name, description, instruction, tools)
+SPECIALIST_AGENTS = (
+    # File Reader Agent - Specialized in reading and analyzing files
+    ("file_reader",
+     "Specialized agent for reading and analyzing files in the workspace",
+     """You are a file reading specialist. Your job is to:
 1. Read files from the workspace using the provided tools
 2. Analyze file content and structure
 3. Provide insights about file content
@@ -35,19 +25,12 @@ class FileOperationsCoordinator:
 
 Always use the appropriate tools to read files and provide clear, structured analysis.
 """,
-            tools=[
-                file_tools.read_file,
-                file_tools.list_files,
-                file_tools.git_status
-            ]
-        )
-        
-        # File Writer Agent - Specialized in writing and creating files
-        self.agents["file_writer"] = Agent(
-            name="file_writer",
-            model=os.getenv("GEMINI_MODEL", "gemini-2.0-flash-live-001"),
-            description="Specialized agent for writing and creating files in the workspace",
-            instruction="""You are a file writing specialist. Your job is to:
+     (file_tools.read_file, file_tools.list_files, file_tools.git_status)),
+    
+    # File Writer Agent - Specialized in writing and creating files
+    ("file_writer",
+     "Specialized agent for writing and creating files in the workspace",
+     """You are a file writing specialist. Your job is to:
 1. Write content to files in the workspace
 2. Create new files with appropriate content
 3. Modify existing files when needed
@@ -56,20 +39,12 @@ Always use the appropriate tools to read files and provide clear, structured ana
 
 Always use the appropriate tools to write files and ensure content is well-structured.
 """,
-            tools=[
-                file_tools.write_file,
-                file_tools.create_directory,
-                file_tools.list_files,
-                file_tools.git_commit
-            ]
-        )
-        
-        # Git Manager Agent - Specialized in git operations
-        self.agents["git_manager"] = Agent(
-            name="git_manager",
-            model=os.getenv("GEMINI_MODEL", "gemini-2.0-flash-live-001"),
-            description="Specialized agent for managing git operations in the workspace",
-            instruction="""You are a git management specialist. Your job is to:
+     (file_tools.write_file, file_tools.create_directory, file_tools.list_files, file_tools.git_commit)),
+    
+    # Git Manager Agent - Specialized in git operations
+    ("git_manager",
+     "Specialized agent for managing git operations in the workspace",
+     """You are a git management specialist. Your job is to:
 1. Monitor git status of the workspace
 2. Commit changes when appropriate
 3. Manage git operations and history
@@ -78,17 +53,36 @@ Always use the appropriate tools to write files and ensure content is well-struc
 
 Always use the appropriate tools to manage git operations and maintain clean history.
 """,
-            tools=[
-                file_tools.git_status,
-                file_tools.git_commit,
-                file_tools.list_files
-            ]
-        )
+     (file_tools.git_status, file_tools.git_commit, file_tools.list_files))
+)
+
+class FileOperationsCoordinator:
+    """Coordinates multiple agents for file operations"""
+    
+    def __init__(self):
+        self.agents = {}
+        self.a2a_agents = {}
+        self._agent_tools: Dict[str, AgentTool] = {}
+        # One model instance for every agent, so they share its API client and connection pool
+        self._model = Gemini(model=os.getenv("GEMINI_MODEL", "gemini-2.0-flash-live-001"))
+        self._setup_agents()
+    
+    def _setup_agents(self):
+        """Setup the specialized agents"""
+        
+        for name, description, instruction, tools in SPECIALIST_AGENTS:
+            self.agents[name] = Agent(
+                name=name,
+                model=self._model,
+                description=description,
+                instruction=instruction,
+                tools=list(tools)
+            )
         
         # File Operations Coordinator - Main coordinator agent
         self.agents["file_coordinator"] = Agent(
             name="file_coordinator",
-            model=os.getenv("GEMINI_MODEL", "gemini-2.0-flash-live-001"),
+            model=self._model,
             description="Main coordinator agent that manages file operations workflow",
             instruction="""You are the main coordinator for file operations. Your job is to:
 1. Analyze user requests and determine the appropriate workflow
@@ -105,9 +99,9 @@ You can use AgentTool to invoke other agents:
 Coordinate effectively to provide the best user experience.
 """,
             tools=[
-                AgentTool(agent=self.agents["file_reader"]),
-                AgentTool(agent=self.agents["file_writer"]),
-                AgentTool(agent=self.agents["git_manager"]),
+                self.get_agent_tool("file_reader"),
+                self.get_agent_tool("file_writer"),
+                self.get_agent_tool("git_manager"),
                 file_tools.list_files,
                 file_tools.git_status
             ]
@@ -121,6 +115,13 @@ Coordinate effectively to provide the best user experience.
         """Get all available agents"""
         return self.agents.copy()
     
+    def get_agent_tool(self, name: str) -> AgentTool:
+        """Get the AgentTool wrapping an agent, built once per agent and shared by every caller"""
+        tool = self._agent_tools.get(name)
+        if tool is None:
+            tool = self._agent_tools[name] = AgentTool(agent=self.agents[name])
+        return tool
+    
     def create_sequential_workflow(self, agents: List[str], name: str = "sequential_workflow") -> SequentialAgent:
         """Create a sequential workflow with specified agents"""
         agent_list = [self.agents[agent] for agent in agents if agent in self.agents]
@@ -5,6 +5,9 @@ Provides tools for reading, writing, and managing files in a git workspace
 
 import os
 import git
+import stat
+import time
+import atexit
 import json
 import yaml
 from pathlib import Path
@@ -19,6 +22,25 @@ class FileOperationsTools:
         self.workspace_path = Path(workspace_path)
         self.workspace_path.mkdir(exist_ok=True)
         self.repo = None
+        
+        # Settings read by the tools on every call, resolved once
+        self._git_enabled = os.getenv("ENABLE_GIT_OPERATIONS", "true").lower() == "true"
+        self._auto_commit = os.getenv("AUTO_COMMIT", "true").lower() == "true"
+        self._commit_prefix = os.getenv("COMMIT_MESSAGE_PREFIX", "[Agent]")
+        self._max_file_size = float(os.getenv("MAX_FILE_SIZE_MB", "10"))
+        self._commit_batch_size = int(os.getenv("AUTO_COMMIT_BATCH_SIZE", "10"))
+        self._status_ttl = float(os.getenv("GIT_STATUS_CACHE_TTL", "2"))
+        
+        # Last git_status result, reused until a tool changes the workspace, the git metadata
+        # changes on disk, or it is older than GIT_STATUS_CACHE_TTL (for edits made outside the tools)
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_sentinel = None
+        self._status_at = 0.0
+        
+        # (path, action) changes from the tools, staged and auto-committed together by flush_git
+        self._pending_commits: List[tuple] = []
+        atexit.register(self.flush_git)
+        
         self._initialize_git_repo()
     
     def _initialize_git_repo(self):
@@ -52,34 +74,64 @@ class FileOperationsTools:
     )
     def read_file(
         self,
-        file_path: str = Schema(description="Path to the file relative to workspace root")
+        file_path: str = Schema(description="Path to the file relative to workspace root"),
+        offset: int = Schema(description="Byte offset to start reading from", default=0),
+        length: Optional[int] = Schema(description="Maximum number of bytes to read (default: to end of file)", default=None)
     ) -> Dict[str, Any]:
-        """Read a file from the workspace"""
+        """Read a file, or a byte range of it, from the workspace"""
         try:
             full_path = self.workspace_path / file_path
-            if not full_path.exists():
+            try:
+                info = os.stat(full_path)
+            except (FileNotFoundError, NotADirectoryError):
                 return {"error": f"File not found: {file_path}"}
             
-            if not full_path.is_file():
+            if not stat.S_ISREG(info.st_mode):
                 return {"error": f"Path is not a file: {file_path}"}
             
-            # Check file size limit
-            file_size_mb = full_path.stat().st_size / (1024 * 1024)
-            max_size = float(os.getenv("MAX_FILE_SIZE_MB", "10"))
-            if file_size_mb > max_size:
-                return {"error": f"File too large: {file_size_mb:.2f}MB (max: {max_size}MB)"}
-            
-            # Read file content
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            return {
+            # Check size limit against what will actually be read, so large files can still be read in ranges
+            offset = max(offset, 0)
+            to_read = max(info.st_size - offset, 0)
+            if length is not None:
+                to_read = min(to_read, max(length, 0))
+            file_size_mb = info.st_size / (1024 * 1024)
+            read_mb = to_read / (1024 * 1024)
+            if read_mb > self._max_file_size:
+                return {"error": f"File too large: {read_mb:.2f}MB (max: {self._max_file_size}MB)"}
+            
+            # Read straight into one buffer of the known size, without an intermediate text layer
+            data = bytearray(to_read)
+            view = memoryview(data)
+            read = 0
+            with open(full_path, 'rb', buffering=0) as f:
+                if offset:
+                    f.seek(offset)
+                while read < to_read:
+                    n = f.readinto(view[read:])
+                    if not n:
+                        break
+                    read += n
+            view.release()
+            del data[read:]
+            
+            # A range can start or end inside a multi-byte character
+            partial = read < info.st_size
+            content = data.decode('utf-8', errors='replace' if partial else 'strict')
+            if '\r' in content:
+                # Same newline translation as reading in text mode
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            
+            result = {
                 "success": True,
                 "file_path": file_path,
                 "content": content,
-                "size_bytes": len(content),
+                "size_bytes": info.st_size,
                 "size_mb": file_size_mb
             }
+            if partial:
+                result["offset"] = offset
+                result["bytes_read"] = read
+            return result
         except Exception as e:
             return {"error": f"Failed to read file: {str(e)}"}
     
@@ -97,26 +149,35 @@ class FileOperationsTools:
         try:
             full_path = self.workspace_path / file_path
             
-            # Check if file exists and overwrite setting
-            if full_path.exists() and not overwrite:
-                return {"error": f"File already exists and overwrite=False: {file_path}"}
-            
             # Create parent directories if needed
             full_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Write file content
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Without overwrite, O_EXCL makes the existence check part of the open
+            flags = os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC | (os.O_TRUNC if overwrite else os.O_EXCL)
+            try:
+                fd = os.open(full_path, flags, 0o666)
+            except FileExistsError:
+                return {"error": f"File already exists and overwrite=False: {file_path}"}
+            
+            # Write the encoded content straight to the descriptor, looping only on a short write
+            data = content.encode('utf-8')
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+            self._invalidate_status()
             
             # Git operations if enabled
-            if self.repo and os.getenv("ENABLE_GIT_OPERATIONS", "true").lower() == "true":
+            if self.repo and self._git_enabled:
                 self._git_add_and_commit(file_path, "Write file")
             
             return {
                 "success": True,
                 "file_path": file_path,
-                "bytes_written": len(content),
-                "git_committed": bool(self.repo and os.getenv("ENABLE_GIT_OPERATIONS", "true").lower() == "true")
+                "bytes_written": len(data),
+                "git_committed": bool(self.repo and self._git_enabled)
             }
         except Exception as e:
             return {"error": f"Failed to write file: {str(e)}"}
@@ -142,18 +203,9 @@ class FileOperationsTools:
             files = []
             dirs = []
             
-            if recursive:
-                for item in target_path.rglob("*"):
-                    if item.is_file():
-                        files.append(str(item.relative_to(self.workspace_path)))
-                    elif item.is_dir():
-                        dirs.append(str(item.relative_to(self.workspace_path)))
-            else:
-                for item in target_path.iterdir():
-                    if item.is_file():
-                        files.append(str(item.relative_to(self.workspace_path)))
-                    elif item.is_dir():
-                        dirs.append(str(item.relative_to(self.workspace_path)))
+            # Workspace-relative names are built by string joins from the listed directory's own
+            base = str(target_path.relative_to(self.workspace_path))
+            self._scan_directory(str(target_path), "" if base == "." else base, recursive, files, dirs)
             
             return {
                 "success": True,
@@ -166,6 +218,22 @@ class FileOperationsTools:
         except Exception as e:
             return {"error": f"Failed to list files: {str(e)}"}
     
+    def _scan_directory(self, path: str, relative: str, recursive: bool, files: List[str], dirs: List[str]):
+        """Collect the files and directories under path for list_files
+        
+        Uses os.scandir, whose entries answer is_file/is_dir from the directory read where the
+        platform allows. Like Path.rglob, symlinked directories are listed but not descended into.
+        """
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = os.path.join(relative, entry.name) if relative else entry.name
+                if entry.is_file():
+                    files.append(name)
+                elif entry.is_dir():
+                    dirs.append(name)
+                    if recursive and not entry.is_symlink():
+                        self._scan_directory(entry.path, name, recursive, files, dirs)
+    
     @FunctionTool(
         name="delete_file",
         description="Delete a file from the workspace"
@@ -186,16 +254,17 @@ class FileOperationsTools:
             
             # Delete the file
             full_path.unlink()
+            self._invalidate_status()
             
             # Git operations if enabled
-            if self.repo and os.getenv("ENABLE_GIT_OPERATIONS", "true").lower() == "true":
+            if self.repo and self._git_enabled:
                 self._git_add_and_commit(file_path, "Delete file")
             
             return {
                 "success": True,
                 "file_path": file_path,
                 "deleted": True,
-                "git_committed": bool(self.repo and os.getenv("ENABLE_GIT_OPERATIONS", "true").lower() == "true")
+                "git_committed": bool(self.repo and self._git_enabled)
             }
         except Exception as e:
             return {"error": f"Failed to delete file: {str(e)}"}
@@ -217,16 +286,17 @@ class FileOperationsTools:
             
             # Create directory
             full_path.mkdir(parents=True, exist_ok=True)
+            self._invalidate_status()
             
             # Git operations if enabled
-            if self.repo and os.getenv("ENABLE_GIT_OPERATIONS", "true").lower() == "true":
+            if self.repo and self._git_enabled:
                 self._git_add_and_commit(directory_path, "Create directory")
             
             return {
                 "success": True,
                 "directory_path": directory_path,
                 "created": True,
-                "git_committed": bool(self.repo and os.getenv("ENABLE_GIT_OPERATIONS", "true").lower() == "true")
+                "git_committed": bool(self.repo and self._git_enabled)
             }
         except Exception as e:
             return {"error": f"Failed to create directory: {str(e)}"}
@@ -241,6 +311,10 @@ class FileOperationsTools:
             if not self.repo:
                 return {"error": "Git repository not initialized"}
             
+            if (self._status_cache is not None and self._git_sentinel() == self._status_sentinel
+                    and time.monotonic() - self._status_at < self._status_ttl):
+                return dict(self._status_cache)
+            
             # Get status
             status = self.repo.git.status()
             
@@ -250,13 +324,19 @@ class FileOperationsTools:
             # Get last commit
             last_commit = self.repo.head.commit.hexsha[:8] if self.repo.head.commit else None
             
-            return {
+            result = {
                 "success": True,
                 "status": status,
                 "current_branch": current_branch,
                 "last_commit": last_commit,
                 "is_dirty": self.repo.is_dirty()
             }
+            
+            # Stamped after running git, since `git status` may itself refresh the index
+            self._status_cache = result
+            self._status_sentinel = self._git_sentinel()
+            self._status_at = time.monotonic()
+            return dict(result)
         except Exception as e:
             return {"error": f"Failed to get git status: {str(e)}"}
     
@@ -274,6 +354,9 @@ class FileOperationsTools:
             if not self.repo:
                 return {"error": "Git repository not initialized"}
             
+            # Commit queued tool changes under their own messages first
+            self.flush_git()
+            
             # Add files
             if files:
                 for file_path in files:
@@ -283,40 +366,73 @@ class FileOperationsTools:
             else:
                 self.repo.index.add("*")
             
-            # Check if there are changes to commit
-            if not self.repo.index.diff("HEAD"):
+            # Staged changes, diffed once: both the nothing-to-commit check and the file count use it
+            staged = self.repo.index.diff("HEAD")
+            if not staged:
                 return {"error": "No changes to commit"}
             
             # Create commit message with prefix
-            prefix = os.getenv("COMMIT_MESSAGE_PREFIX", "[Agent]")
-            full_message = f"{prefix} {message}"
+            full_message = f"{self._commit_prefix} {message}"
             
             # Commit
             commit = self.repo.index.commit(full_message)
+            self._invalidate_status()
             
             return {
                 "success": True,
                 "commit_hash": commit.hexsha,
                 "commit_message": full_message,
-                "files_committed": len(self.repo.index.diff("HEAD"))
+                "files_committed": len(staged)
             }
         except Exception as e:
             return {"error": f"Failed to commit: {str(e)}"}
     
+    def _git_sentinel(self):
+        """Stat stamps of HEAD and the index, which change with any commit, checkout or staging"""
+        stamps = []
+        for name in ("HEAD", "index"):
+            try:
+                stamps.append(os.stat(os.path.join(self.repo.git_dir, name)).st_mtime_ns)
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+    
+    def _invalidate_status(self):
+        """Drop the cached git_status result after a tool changes the workspace"""
+        self._status_cache = None
+    
     def _git_add_and_commit(self, file_path: str, action: str):
-        """Helper method to add and commit a file"""
+        """Queue a changed file for the next batched add and commit"""
+        if not self.repo:
+            return
+        
+        self._pending_commits.append((file_path, action))
+        if len(self._pending_commits) >= self._commit_batch_size:
+            self.flush_git()
+    
+    def flush_git(self):
+        """Stage the queued file changes with one index update and, with AUTO_COMMIT, commit them together"""
+        pending, self._pending_commits = self._pending_commits, []
         try:
-            if not self.repo:
+            if not self.repo or not pending:
                 return
             
-            full_path = self.workspace_path / file_path
-            if full_path.exists():
-                self.repo.index.add([str(full_path)])
-                
-                if os.getenv("AUTO_COMMIT", "true").lower() == "true":
-                    prefix = os.getenv("COMMIT_MESSAGE_PREFIX", "[Agent]")
-                    message = f"{prefix} {action}: {file_path}"
-                    self.repo.index.commit(message)
+            paths = [str(self.workspace_path / file_path) for file_path, _ in pending]
+            existing = [path for path in paths if os.path.exists(path)]
+            if not existing:
+                return
+            self.repo.index.add(existing)
+            self._invalidate_status()
+            
+            if self._auto_commit:
+                if len(pending) == 1:
+                    file_path, action = pending[0]
+                    message = f"{self._commit_prefix} {action}: {file_path}"
+                else:
+                    message = f"{self._commit_prefix} {len(pending)} file operations\n\n" + "\n".join(
+                        f"{action}: {file_path}" for file_path, action in pending
+                    )
+                self.repo.index.commit(message)
         except Exception as e:
             print(f"Git operation failed: {e}")
 
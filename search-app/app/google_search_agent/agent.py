@@ -7,6 +7,8 @@ import os
 import json
 import asyncio
 import time
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
@@ -16,6 +18,19 @@ from google.adk.tools import FunctionTool, google_search
 # Load environment variables from root .env
 load_dotenv(dotenv_path="../../.env")
 
+# Longest query prefix used in result filenames, and the space-to-underscore mapping applied to it
+_SLUG_LENGTH = 30
+_SLUG_TABLE = str.maketrans(" ", "_")
+
+@lru_cache(maxsize=256)
+def _query_slug(query: str) -> str:
+    """Filename-safe slug from the first _SLUG_LENGTH usable characters of a query
+    
+    Stops scanning once enough characters are kept, so long queries cost no more than short ones.
+    """
+    kept = islice((c for c in query if c.isalnum() or c in " -_"), _SLUG_LENGTH)
+    return "".join(kept).rstrip().translate(_SLUG_TABLE)
+
 class SearchAgent:
     """Search Agent using built-in ADK google_search tool with workspace task monitoring"""
     
@@ -69,8 +84,7 @@ You monitor the workspace for search-related tasks and execute them autonomously
         try:
             if not filename:
                 query = results.get("query", results.get("topic", "search"))
-                safe_query = "".join(c for c in query if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                filename = f"search_results_{safe_query.replace(' ', '_')[:30]}.json"
+                filename = f"search_results_{_query_slug(query)}.json"
             
             # Ensure results directory exists
             results_dir = workspace_path / "search_results"
@@ -162,11 +176,12 @@ You monitor the workspace for search-related tasks and execute them autonomously
             
             # Extract search query from description
             description = task_data["description"]
+            description_lower = description.lower()
             
-            if "search for" in description.lower():
-                query = description.lower().split("search for")[1].strip()
-            elif "research" in description.lower():
-                query = description.lower().replace("research", "").strip()
+            if "search for" in description_lower:
+                query = description_lower.split("search for")[1].strip()
+            elif "research" in description_lower:
+                query = description_lower.replace("research", "").strip()
             else:
                 query = description
             